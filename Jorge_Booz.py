@@ -1,8 +1,13 @@
 import streamlit as st
 
+from sneakers import instrument
+
 # Configuração da página
 st.set_page_config(page_title="Jorge Booz - Engenheiro de Software", layout="wide")
 
+# Instrumentação da execução (painel de depuração opcional: ?debug=1)
+instrument.start_run("home")
+
 # Estilos CSS personalizados
 st.markdown(
     """
@@ -240,4 +245,6 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True,
-)
\ No newline at end of file
+)
+
+instrument.finish_run()
@@ -0,0 +1 @@
+# Benchmarks do dashboard. Execute a partir da raiz: python -m benchmarks.<nome>
@@ -0,0 +1,85 @@
+import argparse
+import multiprocessing
+import os
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from benchmarks.synthetic import make_raw_sales
+from benchmarks.timing import timed
+from sneakers.backends import db_path, open_backend
+from sneakers.chartdata import FIGURES
+from sneakers.cube import cube_path
+from sneakers.snapshot import snapshot_path
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Blocos do CSV sintético: 50M linhas não cabem de uma vez em memória
+WRITE_CHUNK = 5_000_000
+
+QUERIES = {
+    "best_seller": lambda backend: backend.best_seller(),
+    "columns": lambda backend: backend.column_summaries(),
+    "corr": lambda backend: backend.correlation(),
+    "group_counts": lambda backend: backend.group_counts(),
+    "cube": lambda backend: backend.cube(),
+    "chart_data": lambda backend: [backend.chart_data(name) for name in FIGURES],
+    "sketches": lambda backend: backend.sketches(),
+}
+
+
+def write_large_csv(path, n_rows):
+    for i, start in enumerate(range(0, n_rows, WRITE_CHUNK)):
+        chunk = make_raw_sales(min(WRITE_CHUNK, n_rows - start), seed=i)
+        chunk.to_csv(path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+    return path
+
+
+def peak_rss_mb():
+    # Pico de memória residente do processo (ru_maxrss em KB no Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(csv, name):
+    """Abre o backend a partir do CSV (sem snapshot, cubo ou banco prévios) e roda as consultas.
+
+    Executado em um processo novo por backend, para que o pico de memória de
+    um não apareça na medição do outro.
+    """
+    for derived in (snapshot_path(csv), cube_path(csv), db_path(csv)):
+        if os.path.exists(derived):
+            os.remove(derived)
+    backend, seconds = timed(lambda: open_backend(csv, name))
+    rows = [("abrir", seconds, peak_rss_mb())]
+    for query, fn in QUERIES.items():
+        _, seconds = timed(lambda: fn(backend))
+        rows.append((query, seconds, peak_rss_mb()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas do dashboard: backend pandas vs DuckDB")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 50_000_000])
+    parser.add_argument("--backends", nargs="+", default=["pandas", "duckdb"])
+    parser.add_argument("--data-dir", default=DATA_DIR, help="onde os CSVs sintéticos são gerados e reaproveitados")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    print(f"{'linhas':>12} {'backend':<8} {'etapa':<14} {'tempo':>10} {'pico RSS':>10}")
+    for n_rows in args.rows:
+        csv = os.path.join(args.data_dir, f"backends_{n_rows}.csv")
+        if not os.path.exists(csv):
+            write_large_csv(csv, n_rows)
+        for name in args.backends:
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                try:
+                    rows = pool.submit(run_backend, csv, name).result()
+                except (MemoryError, BrokenProcessPool):
+                    print(f"{n_rows:>12,} {name:<8} {'abrir':<14} {'sem memória':>10}")
+                    continue
+            for stage, seconds, peak in rows:
+                print(f"{n_rows:>12,} {name:<8} {stage:<14} {seconds * 1e3:>8.0f}ms {peak:>8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_sales
+from benchmarks.timing import best_of
+from sneakers.data import clean_data
+from sneakers.index import SalesIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de filtros: máscara booleana vs índices")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start, end = pd.Timestamp("2018-01-01"), pd.Timestamp("2018-03-31")
+    print(f"{'linhas':>12} {'filtro':<22} {'máscara':>10} {'índice':>10} {'ganho':>8}")
+    for n_rows in args.rows:
+        df = clean_data(make_raw_sales(n_rows)).sort_values("Order Date", kind="stable", ignore_index=True)
+        index = SalesIndex(df)
+        brand = df["Brand"].iloc[0]
+        sneaker = df["Sneaker Name"].iloc[0]
+        dates = df["Order Date"]
+
+        cases = {
+            "período": (
+                lambda: df[dates.between(start, end)],
+                lambda: index.filter(start, end),
+            ),
+            "marca": (
+                lambda: df[df["Brand"] == brand],
+                lambda: index.filter(brand=brand),
+            ),
+            "período+marca+modelo": (
+                lambda: df[dates.between(start, end) & (df["Brand"] == brand) & (df["Sneaker Name"] == sneaker)],
+                lambda: index.filter(start, end, brand=brand, sneaker=sneaker),
+            ),
+        }
+        for name, (mask_fn, index_fn) in cases.items():
+            assert np.array_equal(mask_fn().index, index_fn().index)
+            t_mask = best_of(mask_fn, args.repeat)
+            t_index = best_of(index_fn, args.repeat)
+            print(f"{n_rows:>12,} {name:<22} {t_mask * 1e3:>8.2f}ms {t_index * 1e3:>8.2f}ms {t_mask / t_index:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers.data import clean_data
+from sneakers.parallel import GROUP_BY, group_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalabilidade de group_stats com o número de processos")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, 16, 32, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    df = clean_data(make_raw_sales(args.rows))
+    print(f"{args.rows:,} linhas, grupos por {GROUP_BY}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = group_stats(df, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>4} processos: {elapsed:7.2f}s  {args.rows / elapsed:>12,.0f} linhas/s  "
+              f"{baseline / elapsed:5.1f}x  ({len(result)} grupos)")
+
+
+if __name__ == "__main__":
+    main()
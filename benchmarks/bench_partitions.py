@@ -0,0 +1,45 @@
+import argparse
+import os
+
+from benchmarks.synthetic import make_raw_sales
+from benchmarks.timing import best_of, timed
+from sneakers.data import clean_data
+from sneakers.partitions import read_partitions, write_partitions
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de diretório particionado: tudo vs partições podadas")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--by", choices=["month", "year", "brand"], default="month")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=DATA_DIR, help="onde os diretórios particionados são gerados e reaproveitados")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>12} {'consulta':<24} {'partições':>10} {'linhas lidas':>13} {'1 thread':>10} {'pool':>10}")
+    for n_rows in args.rows:
+        directory = os.path.join(args.data_dir, f"partitions_{args.by}_{n_rows}")
+        if not os.path.isdir(directory):
+            df = clean_data(make_raw_sales(n_rows)).sort_values("Order Date", kind="stable", ignore_index=True)
+            write_partitions(df, directory, by=args.by)
+            del df
+
+        queries = {
+            "tudo": {},
+            "2017-2019": {"years": (2017, 2019)},
+            "2018": {"years": (2018, 2018)},
+            "Off-White": {"brands": ("Off-White",)},
+            "2019 + Off-White": {"years": (2019, 2019), "brands": ("Off-White",)},
+        }
+        for name, query in queries.items():
+            df, _ = timed(lambda: read_partitions(directory, **query))
+            t_serial = best_of(lambda: read_partitions(directory, max_workers=1, **query), args.repeat)
+            t_pool = best_of(lambda: read_partitions(directory, **query), args.repeat)
+            read, total = df.attrs["partitions"]
+            print(f"{n_rows:>12,} {name:<24} {f'{read}/{total}':>10} {len(df):>13,} "
+                  f"{t_serial * 1e3:>8.1f}ms {t_pool * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_sales
+from benchmarks.timing import best_of
+from sneakers.data import DATA_PATH
+from sneakers.prices import parse_prices
+
+
+def regex_prices(series):
+    # Abordagem original do load_data()
+    return series.replace({'\\$': '', ',': ''}, regex=True).astype(float)
+
+
+def run(label, frame, repeat):
+    for column in ("Sale Price", "Retail Price"):
+        series = frame[column]
+        t_regex = best_of(lambda: regex_prices(series), repeat)
+        t_parse = best_of(lambda: parse_prices(series), repeat)
+        print(f"{label:>12} {column:<13} regex {t_regex:8.3f}s  parse_prices {t_parse:8.3f}s  "
+              f"{t_regex / t_parse:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regex vs parse_prices na limpeza de preços")
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="linhas do arquivo sintético")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if os.path.exists(args.csv):
+        run("csv", pd.read_csv(args.csv, usecols=["Sale Price", "Retail Price"]), args.repeat)
+    else:
+        run("100k sint.", make_raw_sales(100_000), args.repeat)
+    run(f"{args.rows:,} sint.", make_raw_sales(args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_csv
+from benchmarks.timing import timed
+from sneakers.data import derive_columns, parse_columns
+from sneakers.params import ParamTable
+from sneakers.simulation import simulate_bernoulli
+from sneakers.stats import best_seller, column_summaries, correlation
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(fn, make_input=None):
+    """Executa ``fn`` duas vezes: uma sem rastreio, para o tempo de parede, e outra
+    sob tracemalloc, para o pico de memória alocada.
+
+    O tracemalloc intercepta cada alocação e deixa as etapas várias vezes mais
+    lentas, por isso o tempo nunca é medido com ele ligado. Com ``make_input``,
+    cada execução recebe ``fn(make_input())``: etapas que alteram a entrada
+    (parse, derive) não rodam a segunda vez sobre colunas já convertidas, e a
+    cópia fica fora das duas medições.
+    """
+    args = () if make_input is None else (make_input(),)
+    gc.collect()
+    result, elapsed = timed(lambda: fn(*args))
+    del result, args
+    args = () if make_input is None else (make_input(),)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bernoulli_stage(df):
+    p_success = float((df["Sale Price"] > df["Retail Price"]).mean())
+    return simulate_bernoulli(p_success, n_sim=1000, replications=10_000)
+
+
+def run_size(n_rows, data_dir):
+    """Mede cada etapa do pipeline do dashboard para um tamanho de base."""
+    path = os.path.join(data_dir, f"stockx_{n_rows}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        write_csv(path, n_rows)
+
+    # O ParamTable importa o scipy na primeira chamada: importado antes, fica fora
+    # do tempo da etapa poisson_params
+    importlib.import_module("scipy.stats")
+
+    stages = {}
+
+    def record(name, fn, make_input=None):
+        result, elapsed, peak = measure(fn, make_input)
+        stages[name] = {
+            "seconds": elapsed,
+            "peak_mb": peak / 1e6,
+            "rows_per_sec": n_rows / elapsed if elapsed else None,
+        }
+        return result
+
+    raw = record("read_csv", lambda: pd.read_csv(path))
+    # parse_columns e derive_columns alteram o frame recebido: cada execução parte de uma cópia
+    parsed = record("parse", parse_columns, raw.copy)
+    df = record("derive", derive_columns, parsed.copy)
+    record("best_seller", lambda: best_seller(df))
+    record("summary_stats", lambda: column_summaries(df))
+    record("corr", lambda: correlation(df))
+    record("bernoulli", lambda: bernoulli_stage(df))
+    record("poisson_params", lambda: ParamTable(df))
+    return stages
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, previous_path):
+    """Imprime a razão de tempo entre este resultado e um JSON anterior."""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nComparação com {previous_path} ({previous.get('commit')}): tempo atual / anterior")
+    for size, stages in current["sizes"].items():
+        old_stages = previous["sizes"].get(size, {})
+        for stage, values in stages.items():
+            if stage in old_stages:
+                ratio = values["seconds"] / old_stages[stage]["seconds"]
+                flag = "  <-- regressão" if ratio > 1.2 else ""
+                print(f"{size:>12} {stage:<15} {ratio:6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das etapas de carga, limpeza e agregação")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--data-dir", default=DATA_DIR, help="onde os CSVs sintéticos são gerados e reaproveitados")
+    parser.add_argument("--output", help="arquivo JSON (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "sizes": {},
+    }
+    print(f"{'linhas':>12} {'etapa':<15} {'tempo':>9} {'pico':>10} {'linhas/s':>14}")
+    for n_rows in args.rows:
+        stages = run_size(n_rows, args.data_dir)
+        report["sizes"][str(n_rows)] = stages
+        for stage, values in stages.items():
+            print(f"{n_rows:>12,} {stage:<15} {values['seconds']:>8.3f}s {values['peak_mb']:>8.1f}MB "
+                  f"{values['rows_per_sec']:>14,.0f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
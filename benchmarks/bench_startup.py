@@ -0,0 +1,99 @@
+import argparse
+import ast
+import glob
+import json
+import subprocess
+import sys
+
+# Páginas medidas: a página inicial e todas em pages/
+PAGES = ["Jorge_Booz.py"] + sorted(glob.glob("pages/*.py"))
+
+_FIRST_RUN = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+app = AppTest.from_file({page!r}, default_timeout=600).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "exceptions": [e.value for e in app.exception]}}))
+"""
+
+
+def top_level_imports(page):
+    """Instruções de import executadas ao carregar a página (nível do módulo)."""
+    with open(page, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=page)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def parse_importtime(stderr):
+    """Linhas do -X importtime: (módulo, próprio em us, acumulado em us, profundidade)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def import_report(page, top):
+    """Custo de importação da página num interpretador novo."""
+    statements = top_level_imports(page)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements)],
+        capture_output=True, text=True, check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    roots = [m for m in modules if m[3] == 1]
+    heaviest = sorted(roots, key=lambda m: m[2], reverse=True)[:top]
+    return {
+        "imports": statements,
+        "total_ms": sum(m[2] for m in roots) / 1e3,
+        "modules": len(modules),
+        "heaviest": [{"module": name, "cumulative_ms": cumulative / 1e3} for name, _, cumulative, _ in heaviest],
+    }
+
+
+def first_run(page):
+    """Tempo da primeira execução completa da página num processo novo (worker frio)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _FIRST_RUN.format(page=page)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1:]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de importação e primeira execução por página")
+    parser.add_argument("--top", type=int, default=8, help="módulos mais pesados listados por página")
+    parser.add_argument("--skip-run", action="store_true", help="mede só as importações")
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    args = parser.parse_args()
+
+    report = {}
+    for page in PAGES:
+        entry = import_report(page, args.top)
+        if not args.skip_run:
+            entry["first_run"] = first_run(page)
+        report[page] = entry
+
+        print(f"\n{page}: {entry['total_ms']:.0f} ms em imports ({entry['modules']} módulos)")
+        for module in entry["heaviest"]:
+            print(f"    {module['cumulative_ms']:8.1f} ms  {module['module']}")
+        if "first_run" in entry:
+            run = entry["first_run"]
+            if "seconds" in run:
+                print(f"    primeira execução: {run['seconds']:.2f} s")
+            else:
+                print(f"    primeira execução falhou: {run['error']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+# Modelos, marcas e preços de varejo no formato do dataset da StockX
+SNEAKERS = [
+    ("Adidas-Yeezy-Boost-350-V2-Butter", " Yeezy", 220),
+    ("Adidas-Yeezy-Boost-350-V2-Beluga-2pt0", " Yeezy", 220),
+    ("Adidas-Yeezy-Boost-350-V2-Zebra", " Yeezy", 220),
+    ("Adidas-Yeezy-Boost-350-V2-Blue-Tint", " Yeezy", 220),
+    ("Adidas-Yeezy-Boost-350-Low-Oxford-Tan", " Yeezy", 200),
+    ("Nike-Air-Max-90-Off-White", "Off-White", 160),
+    ("Nike-Air-Presto-Off-White", "Off-White", 160),
+    ("Air-Jordan-1-Retro-High-Off-White-Chicago", "Off-White", 190),
+    ("Nike-Air-Force-1-Low-Off-White", "Off-White", 170),
+    ("Nike-Blazer-Mid-Off-White", "Off-White", 130),
+]
+REGIONS = ["California", "New York", "Oregon", "Florida", "Texas", "Michigan", "Illinois"]
+SIZES = [4.0, 5.0, 6.0, 7.0, 8.0, 8.5, 9.0, 9.5, 10.0, 10.5, 11.0, 12.0, 13.0, 14.0]
+
+
+def _format_dates(days, epoch="2017-01-01"):
+    # Formata apenas os dias distintos e espalha pelos índices
+    uniques, inverse = np.unique(days, return_inverse=True)
+    dates = pd.Timestamp(epoch) + pd.to_timedelta(uniques, unit="D")
+    labels = np.array([f"{d.month}/{d.day}/{d.year % 100:02d}" for d in dates], dtype=object)
+    return labels[inverse]
+
+
+def make_raw_sales(n_rows, seed=0):
+    """DataFrame sintético com o schema bruto do CSV (preços como "$1,097")."""
+    rng = np.random.default_rng(seed)
+    model = rng.integers(0, len(SNEAKERS), n_rows)
+    names = np.array([s[0] for s in SNEAKERS], dtype=object)
+    brands = np.array([s[1] for s in SNEAKERS], dtype=object)
+    retail = np.array([s[2] for s in SNEAKERS])[model]
+
+    release_day = rng.integers(0, 700, n_rows)
+    order_day = np.minimum(release_day + rng.geometric(1 / 60, n_rows), 1000)
+    sale = np.round(retail * rng.lognormal(0.6, 0.5, n_rows)).astype(np.int64)
+
+    price_labels = np.array([f"${v:,}" for v in range(int(sale.max()) + 1)], dtype=object)
+    return pd.DataFrame({
+        "Order Date": _format_dates(order_day),
+        "Brand": brands[model],
+        "Sneaker Name": names[model],
+        "Sale Price": price_labels[sale],
+        "Retail Price": price_labels[retail],
+        "Release Date": _format_dates(release_day),
+        "Shoe Size": rng.choice(SIZES, n_rows),
+        "Buyer Region": rng.choice(np.array(REGIONS, dtype=object), n_rows),
+    })
+
+
+def write_csv(path, n_rows, seed=0):
+    make_raw_sales(n_rows, seed).to_csv(path, index=False)
+    return path
@@ -0,0 +1,16 @@
+import time
+
+
+def timed(fn):
+    """Executa ``fn`` uma vez; retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def best_of(fn, repeat):
+    """Menor tempo de parede, em segundos, entre ``repeat`` execuções de ``fn``."""
+    best = float("inf")
+    for _ in range(repeat):
+        best = min(best, timed(fn)[1])
+    return best
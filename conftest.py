@@ -0,0 +1,2 @@
+# Na raiz do repositório: o pytest inclui este diretório no sys.path, então
+# "pytest" (e não só "python -m pytest") encontra os pacotes sneakers e benchmarks.
@@ -1,37 +1,47 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import scipy.stats as stats
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
-import plotnine as plot
-import seaborn as sns
-import matplotlib.pyplot as plt
-from plotnine import *
+
+from sneakers import cube, instrument
+from sneakers.data import month_label
+from sneakers.loader import load_cube, load_heatmap, load_section, load_sketches
+from sneakers.sketch import DEFAULT_DELTA
 
 # Configuração da página
 st.set_page_config(page_title="Dashboard de Distribuições Probabilísticas", layout="wide")
 
+# Instrumentação da execução (painel de depuração opcional: ?debug=1)
+instrument.start_run("exploration")
+
 # Adicionando o logo
 st.logo("logo.png")
 
 # Adicionando o logo
 st.image("logo.png", width=150)
 
-def load_data():
-    df = pd.read_csv("StockX-Data-Contest-2019-3.csv")
-    df["Order Date"] = pd.to_datetime(df["Order Date"], format="%m/%d/%y")
-    df["Release Date"] = pd.to_datetime(df["Release Date"], format="%m/%d/%y")
-    df["Sale Price"] = df["Sale Price"].replace({'\\$': '', ',': ''}, regex=True).astype(float)
-    df["Retail Price"] = df["Retail Price"].replace({'\\$': '', ',': ''}, regex=True).astype(float)
-    df["Shoe Size"] = df["Shoe Size"].astype(float)
-    df["Days to Sell"] = (df["Order Date"] - df["Release Date"]).dt.days
-    df["Price Difference"] = df["Sale Price"] - df["Retail Price"]
-    df['Month'] = df["Order Date"].dt.to_period('M')
-    return df
-
-df = load_data()
+# Modo opcional de mediana aproximada (sketch KLL), para bases muito grandes
+approx_mode = st.sidebar.toggle("Mediana aproximada", value=False)
+if approx_mode:
+    approx_eps = st.sidebar.select_slider(
+        f"Erro de posição (ε, com {1 - DEFAULT_DELTA:.0%} de confiança)",
+        options=[0.001, 0.005, 0.01, 0.05],
+        value=0.01,
+        format_func=lambda eps: f"{eps:.1%}",
+    )
+
+def median_of(column, columns):
+    if approx_mode:
+        return load_sketches(approx_eps)[column].quantile(0.5)
+    return columns[column].median
+
+def median_bound(column):
+    # Mostra o erro da mediana quando o modo aproximado está ativo: um limite
+    # probabilístico (excedido com chance de no máximo δ), não determinístico
+    if approx_mode:
+        sketch = load_sketches(approx_eps)[column]
+        st.caption(
+            f"Mediana aproximada: ± {sketch.rank_error:,.0f} posições com {1 - sketch.delta:.0%} de confiança "
+            f"(ε = {sketch.eps:.1%} de {sketch.n:,} vendas)"
+        )
 
 # Seção de Introdução do Conjunto de Dados
 st.markdown(
@@ -66,23 +76,35 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# Converter a coluna 'Order Date' para datetime
-df['Order Date'] = pd.to_datetime(df['Order Date'])
-
-# Filtrar os dados para os anos de 2017 a 2019
-df_filtrado = df[df['Order Date'].dt.year.between(2017, 2019)]
-
-# Contar as vendas por 'Sneaker Name'
-vendas = df_filtrado['Sneaker Name'].value_counts()
-
-# Obter o tênis mais vendido
-tenis_mais_vendido = vendas.idxmax()
-
-# Exibir o nome do tênis em um H1
-st.markdown(f'<h2 style="color: #fff;">Qual foi o tênis mais vendido entre 2017-2019?</h2>', unsafe_allow_html=True)
-
-st.markdown(f'<h3 style="color: #d10f45;">{tenis_mais_vendido}</h3>', unsafe_allow_html=True)
-st.image("yeezy350.jpg", width=300)
+# Cada seção abaixo é um fragmento: interagir com uma delas reexecuta só ela,
+# e seus números vêm de load_section, calculados uma vez por versão do arquivo.
+# fragment_run registra essas reexecuções parciais como execuções próprias.
+@st.fragment
+@instrument.fragment_run("exploration")
+def secao_mais_vendido():
+    # Exibir o nome do tênis em um H1
+    st.markdown(f'<h2 style="color: #fff;">Qual foi o tênis mais vendido entre 2017-2019?</h2>', unsafe_allow_html=True)
+
+    # Período e marcas são respondidos somando células do cubo mensal, sem varrer as vendas
+    with instrument.stage("cube"):
+        cubo = load_cube()
+    meses = sorted(int(m) for m in cubo["Month"].unique())
+    padrao = [m for m in meses if 2017 <= 1970 + m // 12 <= 2019] or meses
+    periodo = st.select_slider(
+        "Período:", options=meses, value=(padrao[0], padrao[-1]), format_func=month_label,
+    )
+    marcas = st.multiselect("Marcas:", options=list(cubo["Brand"].cat.categories))
+    with instrument.stage("best_seller"):
+        celulas = cube.select(cubo, months=periodo, brands=marcas or None)
+
+        # Tênis mais vendido no período escolhido (2017-2019 por padrão)
+        tenis_mais_vendido = cube.best_seller(celulas)
+
+    st.markdown(f'<h3 style="color: #d10f45;">{tenis_mais_vendido}</h3>', unsafe_allow_html=True)
+    st.caption(f"{cube.totals(celulas)['count']:,} vendas entre {month_label(periodo[0])} e {month_label(periodo[1])}")
+    st.image("yeezy350.jpg", width=300)
+
+secao_mais_vendido()
 
 # Tabela de Identificação do Tipo das Variáveis
 dados = {
@@ -126,88 +148,89 @@ st.markdown("""
 """, unsafe_allow_html=True)
 st.table(df_variaveis)
 
-col1, col2 = st.columns(2)
-
-# Tópico 1: Preços de Venda (Sale Price) - Coluna 1
-with col1:
-    st.markdown("""
-    <h3 style="color: #d10f45;">Margem de Lucro (%)</h3>
-    <p> A margem de lucro representa o percentual de acréscimo entre o preço de venda e o preço de varejo, refletindo o potencial de rentabilidade dos pares.</p>
-    """, unsafe_allow_html=True)
-    
-    # Calculando a margem de lucro percentual para cada sneaker
-    df['Profit Margin (%)'] = ((df['Sale Price'] - df['Retail Price']) / df['Retail Price']) * 100
+@st.fragment
+@instrument.fragment_run("exploration")
+def secao_estatisticas():
+    with instrument.stage("summary_stats"):
+        # No modo aproximado a mediana vem dos sketches: a seção "moments" pula a exata
+        columns = load_section("moments" if approx_mode else "columns")
+
+    col1, col2 = st.columns(2)
+
+    # Tópico 1: Preços de Venda (Sale Price) - Coluna 1
+    with col1:
+        st.markdown("""
+        <h3 style="color: #d10f45;">Margem de Lucro (%)</h3>
+        <p> A margem de lucro representa o percentual de acréscimo entre o preço de venda e o preço de varejo, refletindo o potencial de rentabilidade dos pares.</p>
+        """, unsafe_allow_html=True)
     
-    mean_margin = df['Profit Margin (%)'].mean()
-    median_margin = df['Profit Margin (%)'].median()
-    mode_margin = df['Profit Margin (%)'].mode().iloc[0] if not df['Profit Margin (%)'].mode().empty else np.nan
+        margin = columns['Profit Margin (%)']
+        mean_margin, median_margin, mode_margin = margin.mean, median_of('Profit Margin (%)', columns), margin.mode
     
-    st.write(f"Média: **{mean_margin:.2f}%**")
-    st.write(f"Mediana: **{median_margin:.2f}%**")
-    st.write(f"Moda: **{mode_margin:.2f}%**")
-
-# Tópico 2: Diferença entre Sale Price e Retail Price - Coluna 1
-with col1:
-    st.markdown("""
-    <h3 style="color: #d10f45;">2. Diferença entre Sale Price e Retail Price</h3>
-                <p> Embora a média de $208,61 seja ligeiramente inferior à mediana e à moda de $220,00, isso indica que alguns pares são vendidos por valores menores em seus lançamentos, enquanto muitos pares na revenda estão superinflacionados, sugerindo raridade ou alta demanda pelo par. </p>
-    """, unsafe_allow_html=True)
-    mean_retail = df["Retail Price"].mean()
-    median_retail = df["Retail Price"].median()
-    mode_retail = df["Retail Price"].mode().iloc[0] if not df["Retail Price"].mode().empty else np.nan
-
-    st.write(f"Média: ${mean_retail:.2f}")
-    st.write(f"Mediana: ${median_retail:.2f}")
-    st.write(f"Moda: ${mode_retail:.2f}")   
-
-
-# Tópico 3: Tamanhos Vendidos (Shoe Size) - Coluna 2
-with col2:
-    st.markdown("""
-    <h3 style="color: #d10f45;">3. Tamanhos Vendidos (Shoe Size)</h3>
+        st.write(f"Média: **{mean_margin:.2f}%**")
+        st.write(f"Mediana: **{median_margin:.2f}%**")
+        median_bound('Profit Margin (%)')
+        st.write(f"Moda: **{mode_margin:.2f}%**")
+
+    # Tópico 2: Diferença entre Sale Price e Retail Price - Coluna 1
+    with col1:
+        st.markdown("""
+        <h3 style="color: #d10f45;">2. Diferença entre Sale Price e Retail Price</h3>
+                    <p> Embora a média de $208,61 seja ligeiramente inferior à mediana e à moda de $220,00, isso indica que alguns pares são vendidos por valores menores em seus lançamentos, enquanto muitos pares na revenda estão superinflacionados, sugerindo raridade ou alta demanda pelo par. </p>
+        """, unsafe_allow_html=True)
+        retail = columns["Retail Price"]
+        mean_retail, median_retail, mode_retail = retail.mean, median_of("Retail Price", columns), retail.mode
+
+        st.write(f"Média: ${mean_retail:.2f}")
+        st.write(f"Mediana: ${median_retail:.2f}")
+        median_bound("Retail Price")
+        st.write(f"Moda: ${mode_retail:.2f}")   
+
+
+    # Tópico 3: Tamanhos Vendidos (Shoe Size) - Coluna 2
+    with col2:
+        st.markdown("""
+        <h3 style="color: #d10f45;">3. Tamanhos Vendidos (Shoe Size)</h3>
     
-    <p> As três medidas de tendência central são próximas, indicando um alvo de tamanhos para comprar e revender.</p>
-    """, unsafe_allow_html=True)
-    mean_size = df["Shoe Size"].mean()
-    median_size = df["Shoe Size"].median()
-    mode_size = df["Shoe Size"].mode().iloc[0] if not df["Shoe Size"].mode().empty else np.nan
-    st.write(f"Média do Tamanho: **{mean_size:.2f}**")
-    st.write(f"Mediana do Tamanho: **{median_size:.2f}**")
-    st.write(f"Moda do Tamanho: **{mode_size:.2f}**")
-
-# Tópico 4: Tempo de Espera entre Lançamento e Venda - Coluna 2
-with col2:
-    st.markdown("""
-    <h3 style="color: #d10f45;">4. Tempo de Espera (Data da compra - Data do lançamento)</h3>
-    <p> Se consideramos a de esgotamento da loja como cerca de um mês, metade das vendas podem ser consideradas rápidas(26 dias), porém a baixa procura por alguns pares ou o tempo maior de disponibilidade nas lojas eleva muito o tempo médio de vendas. </p>
-    """, unsafe_allow_html=True)
-    mean_days = df["Days to Sell"].mean()
-    median_days = df["Days to Sell"].median()
-    mode_days = df["Days to Sell"].mode().iloc[0] if not df["Days to Sell"].mode().empty else np.nan
-    st.write(f"Média de Dias para Venda: **{mean_days:.2f} dias**")
-    st.write(f"Mediana de Dias para Venda: **{median_days:.2f} dias**")
+        <p> As três medidas de tendência central são próximas, indicando um alvo de tamanhos para comprar e revender.</p>
+        """, unsafe_allow_html=True)
+        size = columns["Shoe Size"]
+        mean_size, median_size, mode_size = size.mean, median_of("Shoe Size", columns), size.mode
+        st.write(f"Média do Tamanho: **{mean_size:.2f}**")
+        st.write(f"Mediana do Tamanho: **{median_size:.2f}**")
+        median_bound("Shoe Size")
+        st.write(f"Moda do Tamanho: **{mode_size:.2f}**")
+
+    # Tópico 4: Tempo de Espera entre Lançamento e Venda - Coluna 2
+    with col2:
+        st.markdown("""
+        <h3 style="color: #d10f45;">4. Tempo de Espera (Data da compra - Data do lançamento)</h3>
+        <p> Se consideramos a de esgotamento da loja como cerca de um mês, metade das vendas podem ser consideradas rápidas(26 dias), porém a baixa procura por alguns pares ou o tempo maior de disponibilidade nas lojas eleva muito o tempo médio de vendas. </p>
+        """, unsafe_allow_html=True)
+        days = columns["Days to Sell"]
+        mean_days, median_days = days.mean, median_of("Days to Sell", columns)
+        st.write(f"Média de Dias para Venda: **{mean_days:.2f} dias**")
+        st.write(f"Mediana de Dias para Venda: **{median_days:.2f} dias**")
+        median_bound("Days to Sell")
+
+secao_estatisticas()
 
 st.markdown(f"""<h3 'color: #d10f45;'>Em média qual a margem de lucro que se tem ao revender um modelo das duas marcas?</h3>
             <p>Embora a média de 124.82% sugira que, em média, os sneakers são revendidos a mais do que o dobro do preço de lançamento, a moda de 22.73% indica que a maioria dos pares é negociada com um acréscimo de cerca de 22%, demonstrando que alguns outliers elevam significativamente a média.</p>""", unsafe_allow_html=True)
 
 
-df_numeric = df.select_dtypes(include=['number'])
-
-        # Calcula a matriz de correlação completa (com ID)
-corr_matrix = df_numeric.corr()
-
-# Remove a coluna "ID" do heatmap, se existir
-if "id" in df_numeric.columns:
-    df_numeric = df_numeric.drop(columns=["id"])
+@st.fragment
+@instrument.fragment_run("exploration")
+def secao_heatmap():
+    st.markdown('<h1 style="color: #d10f45;">Heatmap da Matriz de Correlação</h1>', unsafe_allow_html=True)
+    # A matriz (sem ID) só é calculada e desenhada quando a seção está visível;
+    # o PNG fica em cache por versão do arquivo, sem nova figura a cada rerun
+    if not st.toggle("Mostrar heatmap", value=True):
+        return
+    with instrument.stage("heatmap"):
+        st.image(load_heatmap(cmap="coolwarm", fmt=".2f", figsize=(8, 6)))
 
-# Recalcula a matriz de correlação sem ID para o heatmap
-corr_matrix_heatmap = df_numeric.corr()
-
-# Exibe um heatmap da matriz de correlação sem ID
-st.markdown('<h1 style="color: #d10f45;">Heatmap da Matriz de Correlação</h1>', unsafe_allow_html=True)
-fig, ax = plt.subplots(figsize=(8, 6))
-sns.heatmap(corr_matrix_heatmap, annot=True, cmap="coolwarm", ax=ax, fmt=".2f")
-st.pyplot(fig)
+secao_heatmap()
 st.markdown('''
 <ul>
      <li>A correlação entre o preço de revenda e o dias para revenda é alta, indicando que quanto menor mais rápida a venda.</li>
@@ -223,4 +246,6 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True,
-)
\ No newline at end of file
+)
+
+instrument.finish_run()
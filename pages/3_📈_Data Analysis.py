@@ -1,101 +1,93 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy.stats import bernoulli, poisson
-
-def load_data():
-    df = pd.read_csv("StockX-Data-Contest-2019-3.csv")
-    df["Order Date"] = pd.to_datetime(df["Order Date"], format="%m/%d/%y")
-    df["Release Date"] = pd.to_datetime(df["Release Date"], format="%m/%d/%y")
-    df["Sale Price"] = df["Sale Price"].replace({'\\$': '', ',': ''}, regex=True).astype(float)
-    df["Retail Price"] = df["Retail Price"].replace({'\\$': '', ',': ''}, regex=True).astype(float)
-    df["Shoe Size"] = df["Shoe Size"].astype(float)
-    df["Days to Sell"] = (df["Order Date"] - df["Release Date"]).dt.days
-    df["Price Difference"] = df["Sale Price"] - df["Retail Price"]
-    df['Month'] = df["Order Date"].dt.to_period('M')
-    return df
-
-df = load_data()
-
-# Criando variável binária: 1 se o sneaker foi vendido acima do preço de varejo, 0 caso contrário
-df["AboveRetail"] = (df["Sale Price"] > df["Retail Price"]).astype(int)
-
-# Calculando a probabilidade de sucesso (venda acima do preço de varejo)
-p_success = df["AboveRetail"].mean()
+
+from sneakers import charts, instrument
+from sneakers.loader import load_chart, load_params, run_simulation
+
+# Instrumentação da execução (painel de depuração opcional: ?debug=1)
+instrument.start_run("analysis")
+
+# Parâmetros por grupo (marca, modelo, tamanho, região), pré-calculados uma vez
+with instrument.stage("params"):
+    params = load_params()
+
+# Probabilidade de sucesso (venda acima do preço de varejo) no conjunto todo
+p_success = params.lookup()["above_rate"]
 
 st.markdown("## Análise de Bernoulli para Vendas de Sneakers")
 st.write("Probabilidade de um sneaker ser vendido acima do preço de varejo:")
 st.write(f"p = {p_success:.2f}")
 
 # Gráfico interativo da distribuição de Bernoulli
-fig_bernoulli = go.Figure()
-fig_bernoulli.add_trace(go.Bar(
-    x=['Venda ≤ Retail', 'Venda > Retail'], 
-    y=[1 - p_success, p_success],
-    marker=dict(color=['#d10f45', '#0f1820']),
-    text=[f"{(1 - p_success) * 100:.2f}%", f"{p_success * 100:.2f}%"],
-    textposition='auto'
-))
-fig_bernoulli.update_layout(
-    title="Distribuição de Bernoulli - Vendas acima do preço de varejo",
-    xaxis_title="Resultado",
-    yaxis_title="Probabilidade"
-)
-st.plotly_chart(fig_bernoulli)
-
-# Simulação de 1000 eventos usando a distribuição de Bernoulli
-n_sim = 1000
-simulated = bernoulli.rvs(p_success, size=n_sim)
-st.write("Simulação de 1000 vendas (0: não acima do retail, 1: acima do retail):")
-st.write(np.bincount(simulated))
-
-st.markdown(f"""<h3 style='color: #d10f45;'>Qual a probabilidade de se ter lucro ao revender um dos modelos?</h3>
+with instrument.stage("plotly:bernoulli"):
+    st.plotly_chart(charts.bernoulli_figure(p_success))
+
+# Simulação de vendas usando a distribuição de Bernoulli (semente fixa, cacheada)
+@st.fragment
+@instrument.fragment_run("analysis")
+def secao_simulacao():
+    n_sim = st.select_slider(
+        "Vendas simuladas:",
+        options=[1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000],
+        value=1_000,
+        format_func=lambda n: f"{n:,}",
+    )
+    with instrument.stage("simulation"):
+        result = run_simulation(p_success, n_sim)
+    st.write(f"Simulação de {n_sim:,} vendas (0: não acima do retail, 1: acima do retail):")
+    st.write(result.first)
+
+    low, high = result.ci_below
+    st.markdown(f"""<h3 style='color: #d10f45;'>Qual a probabilidade de se ter lucro ao revender um dos modelos?</h3>
             <p>De acordo com a distribuição de Bernoulli é muito provável que um tênis seja revendido por um preço superior ao de seu lançamento. 
-            A cada 1000 vendas, apenas {np.bincount(simulated)[0]} foram revendidos por um valor menor que o de lançamento.</p>""", unsafe_allow_html=True)
-
-st.markdown(f"""
-            <p>A distribuição de Bernoulli foi escolhida para analisar a probabilidade de um tênis ser vendido por um preço superior ao de varejo, pois trata-se de um evento binário:"Sucesso" (1) → quando o tênis é vendido acima do preço de varejo."Fracasso" (0) → quando o tênis é vendido pelo mesmo preço ou abaixo do varejo. Como cada venda é um evento independente e só pode ter dois resultados possíveis, a distribuição de Bernoulli é a melhor escolha para modelar esse comportamento. Além disso, ao simular 1000 vendas com base na proporção de tênis revendidos acima do preço de varejo, conseguimos entender melhor a tendência do mercado de revenda.
+            A cada {n_sim:,} vendas, apenas {result.first[0]:,} foram revendidos por um valor menor que o de lançamento
+            (em {result.replications:,} simulações, média de {result.mean_below:,.1f}; intervalo de {result.confidence:.0%}: {low:,.0f} a {high:,.0f}).</p>""", unsafe_allow_html=True)
+    # O texto acompanha o tamanho escolhido no controle acima
+    st.markdown(f"""
+            <p>A distribuição de Bernoulli foi escolhida para analisar a probabilidade de um tênis ser vendido por um preço superior ao de varejo, pois trata-se de um evento binário:"Sucesso" (1) → quando o tênis é vendido acima do preço de varejo."Fracasso" (0) → quando o tênis é vendido pelo mesmo preço ou abaixo do varejo. Como cada venda é um evento independente e só pode ter dois resultados possíveis, a distribuição de Bernoulli é a melhor escolha para modelar esse comportamento. Além disso, ao simular {n_sim:,} vendas com base na proporção de tênis revendidos acima do preço de varejo, conseguimos entender melhor a tendência do mercado de revenda.
 """, unsafe_allow_html=True)
 
+secao_simulacao()
+
 
-# Seleção de marca
-brands = df["Brand"].unique()
+# Seleção de marca (e, opcionalmente, modelo e região)
+brands = params.values("Brand")
 selected_brand = st.selectbox("Selecione a marca para análise:", brands)
+col_model, col_region = st.columns(2)
+selected_model = col_model.selectbox(
+    "Modelo (opcional):", [None] + params.values("Sneaker Name", Brand=selected_brand),
+    format_func=lambda name: "Todos" if name is None else name,
+)
+selected_region = col_region.selectbox(
+    "Região do comprador (opcional):",
+    [None] + params.values("Buyer Region", Brand=selected_brand, **{"Sneaker Name": selected_model}),
+    format_func=lambda region: "Todas" if region is None else region,
+)
 
-# Calculando a proporção de vendas para a marca selecionada
-p_brand = (df["Brand"] == selected_brand).mean()
+# Proporção de vendas e λ da seleção: consulta direta na tabela de parâmetros
+group = params.lookup(brand=selected_brand, sneaker=selected_model, region=selected_region)
+p_brand = group["share"]
 
 # Parâmetro lambda para a distribuição de Poisson
-lambda_val = 20 * p_brand
+lambda_val = group["lam"]
+
+# Os números são do grupo selecionado: a marca, ou marca / modelo / região quando filtrados
+group_label = " / ".join(str(value) for value in (selected_brand, selected_model, selected_region) if value is not None)
+group_kind = "da marca" if selected_model is None and selected_region is None else "do grupo"
 
 st.markdown(f"""
-<h3 style="color: #d10f45;">Análise de Vendas - Distribuição de Poisson para {selected_brand}</h3>
-<p>Considerando 20 vendas, o parâmetro <em>λ</em> é calculado como 20 * (proporção de vendas da marca).<br>
-Proporção de vendas da marca {selected_brand}: <strong>{p_brand:.2%}</strong><br>
+<h3 style="color: #d10f45;">Análise de Vendas - Distribuição de Poisson para {group_label}</h3>
+<p>Considerando 20 vendas, o parâmetro <em>λ</em> é calculado como 20 * (proporção de vendas {group_kind}).<br>
+Proporção de vendas {group_kind} {group_label}: <strong>{p_brand:.2%}</strong><br>
 λ (para 20 vendas): <strong>{lambda_val:.2f}</strong></p>
 """, unsafe_allow_html=True)
 
-# Cálculo da distribuição de Poisson
-k_values = np.arange(0, 21)
-poisson_probs = poisson.pmf(k_values, lambda_val)
+# Distribuição de Poisson já calculada para o grupo
+k_values = params.k
+poisson_probs = group["pmf"]
 
 # Criando gráfico interativo para distribuição de Poisson
-fig_poisson = go.Figure()
-fig_poisson.add_trace(go.Bar(
-    x=k_values, 
-    y=poisson_probs,
-    marker=dict(color="#d10f45"),
-    text=[f"{p*100:.2f}%" for p in poisson_probs],
-    textposition='auto'
-))
-fig_poisson.update_layout(
-    title=f"Distribuição de Poisson para {selected_brand} (λ = {lambda_val:.2f})",
-    xaxis_title="Número de Vendas da Marca",
-    yaxis_title="Probabilidade"
-)
-st.plotly_chart(fig_poisson)
+with instrument.stage("plotly:poisson"):
+    st.plotly_chart(charts.poisson_figure(k_values, poisson_probs, group_label, lambda_val))
 
 st.markdown(f"""<h3 style='color: #d10f45;'>A cada 20 tênis quantos serão da marca Off-White e quantos Adidas?</h3>
             <p>A cada 20 tênis, cerca de 14 serão Yeezy e 6 serão Off-White.
@@ -106,6 +98,16 @@ st.markdown(f"""<h3 style='color: #d10f45;'>A cada 20 tênis quantos serão da m
             O parâmetro λ (lambda), calculado como a taxa de vendas da marca multiplicada por 20, reflete a expectativa de quantos pares dessa marca serão vendidos no conjunto analisado.</p
             """, unsafe_allow_html=True)
 
+# Preço de venda x dias até a venda da marca selecionada: dados reduzidos no
+# servidor (densidade + quantis) e figura montada em cache, o navegador
+# recebe poucos pontos; com dados particionados, as linhas vêm de load_slice e
+# só as partições da marca são lidas
+st.markdown(f"<h3 style='color: #d10f45;'>Preço de venda x dias até a venda - {selected_brand}</h3>", unsafe_allow_html=True)
+with instrument.stage("plotly:price_days"):
+    st.plotly_chart(load_chart("price_days", brand=selected_brand))
+with instrument.stage("plotly:sale_price_hist"):
+    st.plotly_chart(load_chart("sale_price_hist"))
+
 st.markdown(
     """
     <div class="footer">
@@ -114,3 +116,5 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+instrument.finish_run()
@@ -0,0 +1 @@
+# Núcleo de dados compartilhado pelas páginas do dashboard de sneakers.
@@ -0,0 +1,3 @@
+from sneakers.cli import main
+
+main()
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+from sneakers.data import numeric_frame
+from sneakers.index import year_slice
+
+# Colunas resumidas (média, mediana e moda) na página de exploração
+SUMMARY_COLUMNS = ["Profit Margin (%)", "Retail Price", "Shoe Size", "Days to Sell"]
+
+# Colunas da matriz de correlação (mesma ordem de data.numeric_frame)
+CORR_COLUMNS = ["Sale Price", "Retail Price", "Shoe Size", "Days to Sell", "Price Difference", "Profit Margin (%)"]
+
+# Janela usada para o tênis mais vendido
+BEST_SELLER_YEARS = (2017, 2019)
+
+
+def _add_counts(a, b):
+    return a.add(b, fill_value=0).astype(np.int64)
+
+
+def quantile_from_counts(counts, q):
+    """Quantil exato a partir de uma contagem de valores (valor -> ocorrências).
+
+    Usa a interpolação linear padrão de ``Series.quantile``.
+    """
+    counts = counts[counts > 0].sort_index()
+    total = int(counts.sum())
+    if total == 0:
+        return np.nan
+    cumulative = counts.to_numpy().cumsum()
+    values = counts.index.to_numpy(dtype=float)
+    position = (total - 1) * q
+    below = int(np.floor(position))
+    lower = values[np.searchsorted(cumulative, below, side="right")]
+    upper = values[np.searchsorted(cumulative, min(below + 1, total - 1), side="right")]
+    return float(lower + (position - below) * (upper - lower))
+
+
+def median_from_counts(counts):
+    """Mediana exata a partir de uma contagem de valores."""
+    return quantile_from_counts(counts, 0.5)
+
+
+def mode_from_counts(counts):
+    """Menor valor entre os mais frequentes, como ``Series.mode().iloc[0]``."""
+    counts = counts[counts > 0]
+    if counts.empty:
+        return np.nan
+    return float(counts[counts == counts.max()].index.min())
+
+
+class Aggregates:
+    """Agregados das páginas acumulados bloco a bloco.
+
+    Guarda apenas contagens, somas, produtos cruzados (para a correlação) e
+    contagens de valores (para mediana e moda exatas), então o tamanho do
+    estado depende da cardinalidade das colunas e não do número de linhas.
+    Dois objetos podem ser combinados com ``merge``.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.above_retail = 0
+        self.brand_counts = pd.Series(dtype=np.int64)
+        self.best_seller_counts = pd.Series(dtype=np.int64)
+        self.sums = dict.fromkeys(SUMMARY_COLUMNS, 0.0)
+        self.sums_sq = dict.fromkeys(SUMMARY_COLUMNS, 0.0)
+        self.value_counts = {column: pd.Series(dtype=np.int64) for column in SUMMARY_COLUMNS}
+        # Linhas completas, soma e produtos cruzados de CORR_COLUMNS
+        self.corr_n = 0
+        self.corr_sums = np.zeros(len(CORR_COLUMNS))
+        self.corr_cross = np.zeros((len(CORR_COLUMNS), len(CORR_COLUMNS)))
+
+    def update(self, df):
+        """Acumula um bloco já limpo por ``clean_data``."""
+        self.n_rows += len(df)
+        self.above_retail += int((df["Sale Price"] > df["Retail Price"]).sum())
+        self.brand_counts = _add_counts(self.brand_counts, df["Brand"].value_counts())
+
+        first, last = BEST_SELLER_YEARS
+        self.best_seller_counts = _add_counts(
+            self.best_seller_counts, year_slice(df, first, last)["Sneaker Name"].value_counts()
+        )
+
+        numeric = numeric_frame(df)
+        for column in SUMMARY_COLUMNS:
+            values = numeric[column].astype(np.float64)
+            self.sums[column] += float(values.sum())
+            self.sums_sq[column] += float((values * values).sum())
+            self.value_counts[column] = _add_counts(self.value_counts[column], values.value_counts())
+
+        matrix = numeric[CORR_COLUMNS].dropna().to_numpy(dtype=np.float64)
+        self.corr_n += len(matrix)
+        self.corr_sums += matrix.sum(axis=0)
+        self.corr_cross += matrix.T @ matrix
+        return self
+
+    def merge(self, other):
+        """Soma o estado de ``other`` a este objeto."""
+        self.n_rows += other.n_rows
+        self.above_retail += other.above_retail
+        self.brand_counts = _add_counts(self.brand_counts, other.brand_counts)
+        self.best_seller_counts = _add_counts(self.best_seller_counts, other.best_seller_counts)
+        for column in SUMMARY_COLUMNS:
+            self.sums[column] += other.sums[column]
+            self.sums_sq[column] += other.sums_sq[column]
+            self.value_counts[column] = _add_counts(self.value_counts[column], other.value_counts[column])
+        self.corr_n += other.corr_n
+        self.corr_sums += other.corr_sums
+        self.corr_cross += other.corr_cross
+        return self
+
+    @property
+    def brand_share(self):
+        return self.brand_counts / self.n_rows if self.n_rows else self.brand_counts.astype(float)
+
+    @property
+    def above_retail_rate(self):
+        return self.above_retail / self.n_rows if self.n_rows else np.nan
+
+    @property
+    def best_seller(self):
+        counts = self.best_seller_counts[self.best_seller_counts > 0]
+        return counts.idxmax() if not counts.empty else None
+
+    @property
+    def corr(self):
+        """Matriz de correlação de Pearson montada a partir dos produtos cruzados."""
+        n = self.corr_n
+        if n < 2:
+            return pd.DataFrame(np.nan, index=CORR_COLUMNS, columns=CORR_COLUMNS)
+        mean = self.corr_sums / n
+        cov = (self.corr_cross - n * np.outer(mean, mean)) / (n - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(corr, index=CORR_COLUMNS, columns=CORR_COLUMNS)
+
+    def column_stats(self, column):
+        """Média, mediana, moda e desvio padrão amostral de uma coluna resumida."""
+        counts = self.value_counts[column]
+        n = int(counts.sum())
+        mean = self.sums[column] / n if n else np.nan
+        var = (self.sums_sq[column] - n * mean * mean) / (n - 1) if n > 1 else np.nan
+        return {
+            "mean": mean,
+            "median": median_from_counts(counts),
+            "mode": mode_from_counts(counts),
+            "std": float(np.sqrt(max(var, 0.0))) if n > 1 else np.nan,
+        }
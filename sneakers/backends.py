@@ -0,0 +1,453 @@
+import importlib.util
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from sneakers import chartdata, cube, snapshot
+from sneakers.aggregates import BEST_SELLER_YEARS, CORR_COLUMNS, SUMMARY_COLUMNS
+from sneakers.data import CATEGORY_COLUMNS, with_derived
+from sneakers.files import atomic_write
+from sneakers.index import SalesIndex
+from sneakers.params import GROUP_LEVELS, group_counts
+from sneakers.sketch import DEFAULT_EPS, QuantileSketch, merge_sketches
+from sneakers.stats import (
+    QUANTILES, ColumnSummary, SummaryStats, approx_sketches, best_seller, column_summaries, correlation,
+)
+
+# Backend de consulta das métricas: "pandas" (padrão, tudo em memória) ou
+# "duckdb" (banco local em disco, para bases maiores que a memória do worker;
+# precisa do pacote opcional duckdb, comentado em requirements.txt)
+BACKEND_ENV = "SNEAKERS_BACKEND"
+DEFAULT_BACKEND = "pandas"
+
+# Incrementar quando o schema da tabela "sales" ou das consultas mudar
+DB_SCHEMA = 1
+
+# Versão gravada no banco: muda também quando a limpeza muda de schema
+DB_VERSION = f"schema{snapshot.SCHEMA_VERSION}-db{DB_SCHEMA}"
+
+# Linhas por lote lidas do banco para montar os sketches (mesmo bloco de sneakers.sketch.sketch_column)
+SKETCH_BATCH = 1_000_000
+
+
+class Backend(ABC):
+    """Interface única de acesso às métricas das páginas.
+
+    As subclasses respondem às mesmas perguntas com os mesmos tipos de
+    resultado de sneakers.stats, sneakers.params, sneakers.cube e
+    sneakers.chartdata; nenhuma página precisa das linhas em memória.
+    """
+
+    name = None
+
+    @abstractmethod
+    def n_rows(self):
+        ...
+
+    @abstractmethod
+    def best_seller(self, years=BEST_SELLER_YEARS):
+        ...
+
+    @abstractmethod
+    def column_summaries(self, quantiles=QUANTILES):
+        ...
+
+    @abstractmethod
+    def correlation(self):
+        ...
+
+    @abstractmethod
+    def group_counts(self):
+        ...
+
+    @abstractmethod
+    def cube(self):
+        ...
+
+    @abstractmethod
+    def chart_data(self, name, max_points=chartdata.MAX_POINTS, brand=None):
+        """Dados reduzidos do gráfico ``name`` de sneakers.chartdata.FIGURES (marca ``brand`` ou todas)."""
+
+    @abstractmethod
+    def sketches(self, eps=DEFAULT_EPS):
+        """Sketches de quantis das colunas resumidas, como sneakers.stats.approx_sketches."""
+
+    def owned_nbytes(self):
+        """Tamanho no store: o backend só referencia dados de outros caches (frame, índice, banco)."""
+        return sys.getsizeof(self)
+
+    def section(self, section):
+        """Resultado de uma seção de sneakers.stats.SECTIONS ("best_seller", "columns", "moments", "corr")."""
+        return {
+            "best_seller": self.best_seller,
+            "columns": self.column_summaries,
+            "moments": lambda: self.column_summaries(quantiles=()),
+            "corr": self.correlation,
+        }[section]()
+
+    def summary(self):
+        return SummaryStats(
+            n_rows=self.n_rows(),
+            best_seller=self.best_seller(),
+            columns=self.column_summaries(),
+            corr=self.correlation(),
+        )
+
+
+class PandasBackend(Backend):
+    """Métricas calculadas sobre o DataFrame em memória (caminho padrão)."""
+
+    name = "pandas"
+
+    def __init__(self, path, df=None, index=None):
+        self.path = path
+        self.df = df if df is not None else with_derived(snapshot.load(path))
+        self.index = index if index is not None else SalesIndex(self.df)
+
+    def n_rows(self):
+        return len(self.df)
+
+    def best_seller(self, years=BEST_SELLER_YEARS):
+        return best_seller(self.df, years, index=self.index)
+
+    def column_summaries(self, quantiles=QUANTILES):
+        return column_summaries(self.df, quantiles)
+
+    def correlation(self):
+        return correlation(self.df)
+
+    def group_counts(self):
+        return group_counts(self.df)
+
+    def cube(self):
+        return cube.load_cube(self.path, df=self.df)
+
+    def chart_data(self, name, max_points=chartdata.MAX_POINTS, brand=None):
+        df = self.df if brand is None else self.index.select(brands=(brand,))
+        return chartdata.prepare(df, name, max_points)
+
+    def sketches(self, eps=DEFAULT_EPS):
+        return approx_sketches(self.df, eps)
+
+
+def db_path(csv_path):
+    """Arquivo do banco DuckDB ao lado dos dados de origem."""
+    return os.path.splitext(os.path.abspath(csv_path))[0] + ".duckdb"
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _iter_source_chunks(path):
+    # Blocos já limpos: o CSV é lido em partes, e um diretório partição a partição
+    if os.path.isdir(path):
+        from sneakers.partitions import list_partitions, read_partition
+
+        for name in list_partitions(path):
+            yield read_partition(os.path.join(path, name))
+    else:
+        from sneakers.streaming import iter_clean_chunks
+
+        yield from iter_clean_chunks(path)
+
+
+def build_db(csv_path, out_path=None):
+    """Carrega os dados limpos em um banco DuckDB, bloco a bloco.
+
+    A memória usada é a de um bloco, não a do arquivo inteiro. O banco é
+    gravado em arquivo temporário e trocado atomicamente.
+    """
+    out_path = out_path or db_path(csv_path)
+    atomic_write(out_path, lambda tmp_path: _write_db(csv_path, tmp_path))
+    return out_path
+
+
+def _write_db(csv_path, path):
+    import duckdb
+
+    # O DuckDB não abre um arquivo vazio: o temporário criado por atomic_write
+    # (nome único, só desta gravação) é removido e o banco é criado no lugar
+    os.remove(path)
+    con = duckdb.connect(path)
+    try:
+        created = False
+        for chunk in _iter_source_chunks(csv_path):
+            # Categorias viram VARCHAR: cada bloco tem o seu próprio conjunto
+            chunk = chunk.astype({column: object for column in CATEGORY_COLUMNS})
+            con.register("chunk", chunk)
+            if created:
+                con.execute("INSERT INTO sales SELECT * FROM chunk")
+            else:
+                con.execute("CREATE TABLE sales AS SELECT * FROM chunk")
+                created = True
+            con.unregister("chunk")
+        con.execute("CREATE TABLE sneakers_meta AS SELECT ? AS meta",
+                    [json.dumps(snapshot.source_metadata(csv_path, DB_VERSION))])
+    finally:
+        con.close()
+
+
+def db_is_fresh(csv_path, out_path=None):
+    """True se o banco existe, tem a versão atual e corresponde aos dados de origem."""
+    import duckdb
+
+    out_path = out_path or db_path(csv_path)
+    if not os.path.exists(out_path):
+        return False
+    try:
+        con = duckdb.connect(out_path, read_only=True)
+        try:
+            meta = json.loads(con.execute("SELECT meta FROM sneakers_meta").fetchone()[0])
+        finally:
+            con.close()
+    except (duckdb.Error, TypeError, ValueError):
+        return False
+    current = snapshot.check_source(meta, csv_path, DB_VERSION)
+    if current is None:
+        return False
+    if current is not meta:
+        # Conteúdo igual, mtime/tamanho novos: atualiza só os metadados
+        try:
+            con = duckdb.connect(out_path)
+            try:
+                con.execute("UPDATE sneakers_meta SET meta = ?", [json.dumps(current)])
+            finally:
+                con.close()
+        except duckdb.Error:
+            pass
+    return True
+
+
+# Colunas derivadas calculadas na consulta, com a mesma fórmula de sneakers.data
+_DERIVED_SQL = {
+    "Profit Margin (%)": '("Sale Price" - "Retail Price") / "Retail Price" * 100',
+    "Above Retail": '"Sale Price" > "Retail Price"',
+}
+
+
+def _list_sql(values):
+    return "([" + ", ".join(repr(float(v)) for v in values) + "]::DOUBLE[])"
+
+
+def _column_sql(column):
+    return _DERIVED_SQL.get(column, _quote(column))
+
+
+class DuckDBBackend(Backend):
+    """Métricas respondidas por consultas SQL sobre um banco DuckDB local.
+
+    As linhas ficam no arquivo ``.duckdb`` e nunca são carregadas inteiras no
+    processo: cada método é uma consulta agregada. O banco é reconstruído
+    quando os dados de origem mudam.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, path):
+        import duckdb
+
+        self.path = path
+        self.db_path = db_path(path)
+        if not db_is_fresh(path, self.db_path):
+            build_db(path, self.db_path)
+        self._con = duckdb.connect(self.db_path, read_only=True)
+
+    def _query(self, sql, params=None):
+        # Um cursor por consulta: a conexão é compartilhada entre as threads das sessões
+        return self._con.cursor().execute(sql, params or []).df()
+
+    def n_rows(self):
+        return int(self._query("SELECT count(*) AS n FROM sales")["n"].iloc[0])
+
+    def best_seller(self, years=BEST_SELLER_YEARS):
+        first, last = years
+        result = self._query(
+            'SELECT "Sneaker Name" AS name, count(*) AS n FROM sales '
+            'WHERE "Order Date" >= make_timestamp(?, 1, 1, 0, 0, 0) AND "Order Date" < make_timestamp(?, 1, 1, 0, 0, 0) '
+            'GROUP BY 1 ORDER BY n DESC, name LIMIT 1',
+            [first, last + 1],
+        )
+        return result["name"].iloc[0] if len(result) else None
+
+    def column_summaries(self, quantiles=QUANTILES):
+        exprs = {column: f"CAST({_column_sql(column)} AS DOUBLE)" for column in SUMMARY_COLUMNS}
+        # Médias e quantis de todas as colunas em uma única varredura (sem quantis, só as médias)
+        stats = self._query("SELECT " + ", ".join(
+            f"avg({expr}) AS mean_{i}" + (f", quantile_cont({expr}, {list(quantiles)}) AS q_{i}" if quantiles else "")
+            for i, expr in enumerate(exprs.values())
+        ) + " FROM sales").iloc[0]
+        columns = {}
+        for i, (column, expr) in enumerate(exprs.items()):
+            # Moda: o menor dos valores mais frequentes, como em Series.mode()
+            mode = self._query(
+                f"SELECT x FROM (SELECT {expr} AS x FROM sales) WHERE x IS NOT NULL "
+                "GROUP BY x ORDER BY count(*) DESC, x LIMIT 1"
+            )
+            values = stats[f"q_{i}"] if quantiles else None
+            values = {q: float(v) for q, v in zip(quantiles, values)} if values is not None else {}
+            columns[column] = ColumnSummary(
+                mean=float(stats[f"mean_{i}"]) if pd.notna(stats[f"mean_{i}"]) else np.nan,
+                median=values.get(0.5, np.nan),
+                mode=float(mode["x"].iloc[0]) if len(mode) else np.nan,
+                quantiles=values,
+            )
+        return columns
+
+    def correlation(self):
+        pairs = [(i, j) for i in range(len(CORR_COLUMNS)) for j in range(i + 1, len(CORR_COLUMNS))]
+        exprs = ", ".join(
+            f"corr(CAST({_column_sql(CORR_COLUMNS[i])} AS DOUBLE), CAST({_column_sql(CORR_COLUMNS[j])} AS DOUBLE)) AS c{i}_{j}"
+            for i, j in pairs
+        )
+        row = self._query(f"SELECT {exprs} FROM sales").iloc[0]
+        matrix = np.eye(len(CORR_COLUMNS))
+        for i, j in pairs:
+            matrix[i, j] = matrix[j, i] = row[f"c{i}_{j}"]
+        return pd.DataFrame(matrix, index=CORR_COLUMNS, columns=CORR_COLUMNS)
+
+    def group_counts(self):
+        levels = ", ".join(_quote(level) for level in GROUP_LEVELS)
+        base = self._query(
+            f"SELECT {levels}, count(*) AS count, sum(CAST({_DERIVED_SQL['Above Retail']} AS BIGINT)) AS above "
+            f"FROM sales GROUP BY ALL ORDER BY ALL"
+        )
+        return base.astype({
+            **{column: "category" for column in CATEGORY_COLUMNS if column in GROUP_LEVELS},
+            "count": np.int64, "above": np.int64,
+        })
+
+    def cube(self):
+        levels = ", ".join(_quote(level) for level in cube.CUBE_LEVELS)
+        days = []
+        for name, low, high in zip(cube.DAYS_COLUMNS, cube.DAYS_EDGES[:-1], cube.DAYS_EDGES[1:]):
+            conditions = [f'"Days to Sell" >= {low:.0f}'] if np.isfinite(low) else []
+            conditions += [f'"Days to Sell" < {high:.0f}'] if np.isfinite(high) else []
+            days.append(f"count(*) FILTER (WHERE {' AND '.join(conditions)}) AS {name}")
+        cells = self._query(
+            f"SELECT {levels}, count(*) AS count, "
+            'sum(CAST("Sale Price" AS DOUBLE)) AS price_sum, '
+            'sum(CAST("Sale Price" AS DOUBLE) * CAST("Sale Price" AS DOUBLE)) AS price_sumsq, '
+            f"sum(CAST({_DERIVED_SQL['Above Retail']} AS BIGINT)) AS above, {', '.join(days)} "
+            f"FROM sales GROUP BY ALL ORDER BY ALL"
+        )
+        counts = ["count", "above"] + cube.DAYS_COLUMNS
+        return cells.astype({
+            "Month": np.int16, **{column: "category" for column in CATEGORY_COLUMNS},
+            **{column: np.int64 for column in counts},
+        })
+
+    def _finite(self, columns, brand):
+        # Subconsulta com as colunas como DOUBLE, sem NaN/NULL, da marca pedida (ou todas)
+        exprs = ", ".join(f"CAST({_column_sql(column)} AS DOUBLE) AS {alias}" for alias, column in columns.items())
+        where = " AND ".join(f"isfinite({alias})" for alias in columns)
+        source = "sales" if brand is None else 'sales WHERE "Brand" = ?'
+        return f'(SELECT rowid AS rid, "Order Date" AS t, {exprs} FROM {source}) WHERE {where}', [] if brand is None else [brand]
+
+    def _binned(self, columns, bins, brand):
+        """Contagens por faixa de cada coluna (faixas iguais entre o mínimo e o máximo, como np.histogram)."""
+        source, params = self._finite(columns, brand)
+        bounds = self._query(
+            "SELECT " + ", ".join(f"min({a}) AS lo_{a}, max({a}) AS hi_{a}" for a in columns) + f" FROM {source}",
+            params,
+        ).iloc[0]
+        edges = [chartdata.bin_edges(bounds[f"lo_{a}"], bounds[f"hi_{a}"], n) for a, n in zip(columns, bins)]
+        # Faixa i: edges[i] <= x < edges[i + 1], o máximo entra na última. Como em
+        # np.histogram, o índice calculado é corrigido em ±1 comparando com os limites
+        first = ", ".join(
+            f"least(CAST(floor(({a} - {float(e[0])!r}) / {float(e[-1] - e[0])!r} * {n}) AS BIGINT), {n - 1}) AS i_{a}"
+            for a, e, n in zip(columns, edges, bins)
+        )
+        keys = ", ".join(
+            f"i_{a} - CAST({a} < {_list_sql(e)}[i_{a} + 1] AS BIGINT) "
+            f"+ CAST({a} >= {_list_sql(e)}[i_{a} + 2] AND i_{a} < {n - 1} AS BIGINT) AS b_{a}"
+            for a, e, n in zip(columns, edges, bins)
+        )
+        cells = self._query(
+            f"SELECT {keys}, count(*) AS n FROM (SELECT {', '.join(columns)}, {first} FROM {source}) GROUP BY ALL",
+            params,
+        )
+        counts = np.zeros(bins, dtype=np.float64)
+        counts[tuple(cells[f"b_{a}"].to_numpy() for a in columns)] = cells["n"].to_numpy()
+        return counts, edges
+
+    def _histogram(self, column, max_points, brand):
+        counts, (edges,) = self._binned({"x": column}, (chartdata.histogram_bins(max_points),), brand)
+        return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts.astype(np.int64)})
+
+    def _density(self, x, y, max_points, brand):
+        counts, (x_edges, y_edges) = self._binned({"x": x, "y": y}, chartdata.density_grid(max_points), brand)
+        return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T
+
+    def _quantile_series(self, x, y, max_points, brand):
+        # Mesmas regras de chartdata.quantile_series: um ponto por valor de x ou faixas de
+        # linhas; os empates em x seguem a ordem por data, como no frame do loader
+        source, params = self._finite({"x": x, "y": y}, brand)
+        quantiles = list(chartdata.TREND_QUANTILES)
+        n_buckets = chartdata.trend_buckets(max_points)
+        n, distinct = self._query(f"SELECT count(*) AS n, count(DISTINCT x) AS d FROM {source}", params).iloc[0]
+        if distinct <= n_buckets:
+            table = self._query(
+                f"SELECT x, count(*) AS count, quantile_cont(y, {quantiles}) AS q FROM {source} GROUP BY x ORDER BY x",
+                params,
+            )
+        else:
+            table = self._query(
+                f"SELECT quantile_cont(x, 0.5) AS x, count(*) AS count, quantile_cont(y, {quantiles}) AS q FROM ("
+                f"SELECT x, y, (row_number() OVER (ORDER BY x, t, rid) - 1) * {n_buckets} // {int(n)} AS b FROM {source}"
+                ") GROUP BY b ORDER BY b",
+                params,
+            )
+        values = np.array(table.pop("q").tolist(), dtype=np.float64).reshape(len(table), len(quantiles))
+        for name, column in zip(chartdata.quantile_columns(), values.T):
+            table[name] = column
+        return table.astype({"x": np.float64, "count": np.int64})
+
+    def chart_data(self, name, max_points=chartdata.MAX_POINTS, brand=None):
+        # Contagens e quantis calculados no banco: só a grade reduzida chega ao processo
+        if name == "price_days":
+            density_points, trend_points = chartdata.price_days_budget(max_points)
+            return {
+                "density": self._density("Days to Sell", "Sale Price", density_points, brand),
+                "trend": self._quantile_series("Days to Sell", "Sale Price", trend_points, brand),
+            }
+        if name == "sale_price_hist":
+            return self._histogram("Sale Price", max_points, brand)
+        raise KeyError(name)
+
+    def sketches(self, eps=DEFAULT_EPS):
+        # Os valores chegam em lotes de SKETCH_BATCH linhas, e cada lote vira um sketch parcial
+        sketches = {}
+        for column in SUMMARY_COLUMNS:
+            reader = self._con.cursor().execute(
+                f"SELECT CAST({_column_sql(column)} AS DOUBLE) AS x FROM sales"
+            ).fetch_record_batch(SKETCH_BATCH)
+            partials = [QuantileSketch(eps, seed=i).update(batch.column(0).to_numpy(zero_copy_only=False))
+                        for i, batch in enumerate(reader)]
+            sketches[column] = merge_sketches(partials, eps)
+        return sketches
+
+
+BACKENDS = {
+    "pandas": PandasBackend,
+    "duckdb": DuckDBBackend,
+}
+
+
+def open_backend(path, name=None, df=None, index=None):
+    """Abre o backend ``name`` (padrão: SNEAKERS_BACKEND ou "pandas") sobre os dados em ``path``.
+
+    ``df`` e ``index`` são o frame já carregado e seu SalesIndex, reaproveitados pelo backend pandas.
+    """
+    name = name or os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name!r} (opções: {', '.join(BACKENDS)})")
+    if name == "duckdb" and importlib.util.find_spec("duckdb") is None:
+        raise ImportError('O backend "duckdb" precisa do pacote opcional duckdb: pip install duckdb')
+    if name == "pandas":
+        return PandasBackend(path, df=df, index=index)
+    return BACKENDS[name](path)
@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from sneakers import charts
+
+# Orçamento de pontos por gráfico: nenhum gráfico envia ao navegador mais
+# marcas (barras, células ou pontos de linha) do que isso, qualquer que seja o
+# tamanho do conjunto. Pode ser ajustado com SNEAKERS_MAX_POINTS.
+MAX_POINTS = int(os.environ.get("SNEAKERS_MAX_POINTS", 2_000))
+
+TREND_QUANTILES = (0.1, 0.5, 0.9)
+HISTOGRAM_BINS = 100
+DENSITY_BINS = (60, 40)
+
+
+def _finite(*arrays):
+    """Remove as linhas em que algum dos vetores é NaN."""
+    arrays = [np.asarray(a, dtype="float64") for a in arrays]
+    mask = np.logical_and.reduce([np.isfinite(a) for a in arrays])
+    return [a[mask] for a in arrays]
+
+
+def histogram_bins(max_points, bins=HISTOGRAM_BINS):
+    """Número de faixas do histograma dentro do orçamento de pontos."""
+    return max(1, min(bins, max_points))
+
+
+def density_grid(max_points, bins=DENSITY_BINS):
+    """Grade (nx, ny) do heatmap, reduzida proporcionalmente se ``nx * ny`` passar do orçamento."""
+    nx, ny = bins
+    if nx * ny > max_points:
+        scale = np.sqrt(max_points / (nx * ny))
+        nx, ny = max(1, int(nx * scale)), max(1, int(ny * scale))
+    return nx, ny
+
+
+def trend_buckets(max_points, quantiles=TREND_QUANTILES):
+    """Número máximo de pontos da série de quantis."""
+    return max(1, max_points // len(quantiles))
+
+
+def quantile_columns(quantiles=TREND_QUANTILES):
+    return [f"q{round(q * 100)}" for q in quantiles]
+
+
+def bin_edges(lo, hi, n):
+    """Limites de ``n`` faixas iguais entre ``lo`` e ``hi``, como em np.histogram.
+
+    Sem valores (``lo`` None/NaN) a faixa é [0, 1]; com ``lo == hi``, [lo - 0.5, hi + 0.5].
+    """
+    if lo is None or not np.isfinite(lo):
+        lo, hi = 0.0, 1.0
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, n + 1)
+
+
+def histogram(values, max_points=MAX_POINTS, bins=HISTOGRAM_BINS):
+    """Histograma pré-agregado: uma linha por faixa (left, right, count).
+
+    O número de faixas nunca passa de ``max_points``.
+    """
+    (values,) = _finite(values)
+    counts, edges = np.histogram(values, bins=histogram_bins(max_points, bins))
+    return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+
+
+def density(x, y, max_points=MAX_POINTS, bins=DENSITY_BINS):
+    """Contagens 2D (heatmap de densidade) de ``y`` contra ``x``.
+
+    Devolve ``(x_centers, y_centers, counts)`` com ``counts[j, i]`` = número de
+    linhas na faixa ``i`` de ``x`` e ``j`` de ``y``; a grade é reduzida
+    proporcionalmente se ``nx * ny`` passar de ``max_points``.
+    """
+    x, y = _finite(x, y)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=density_grid(max_points, bins))
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T
+
+
+def quantile_series(x, y, max_points=MAX_POINTS, quantiles=TREND_QUANTILES):
+    """Série de quantis de ``y`` ao longo de ``x``, reduzida ao orçamento de pontos.
+
+    Se ``x`` tem poucos valores distintos (como Days to Sell), cada valor vira um
+    ponto e os quantis são exatos; caso contrário as linhas, ordenadas por ``x``,
+    são divididas em faixas com a mesma quantidade de linhas e cada faixa vira
+    um ponto (mediana de ``x``, quantis de ``y``).
+    """
+    x, y = _finite(x, y)
+    if not len(x):
+        return pd.DataFrame(columns=["x", "count"] + quantile_columns(quantiles), dtype=np.float64)
+    n_buckets = trend_buckets(max_points, quantiles)
+    frame = pd.DataFrame({"x": x, "y": y})
+    if frame["x"].nunique() <= n_buckets:
+        grouped = frame.groupby("x")
+        positions = grouped["x"].first()
+    else:
+        order = np.argsort(x, kind="stable")
+        bucket = np.empty(len(x), dtype="int64")
+        bucket[order] = np.arange(len(x)) * n_buckets // len(x)
+        grouped = frame.groupby(bucket)
+        positions = grouped["x"].median()
+    table = grouped["y"].quantile(list(quantiles)).unstack()
+    table.columns = quantile_columns(quantiles)
+    table.insert(0, "x", positions.to_numpy())
+    table.insert(1, "count", grouped.size().to_numpy())
+    return table.reset_index(drop=True)
+
+
+def price_days_budget(max_points):
+    """Divisão do orçamento do gráfico preço x dias: (células do heatmap, pontos da tendência)."""
+    return max_points * 3 // 4, max_points // 4
+
+
+def price_days(df, max_points=MAX_POINTS):
+    """Dados do gráfico Sale Price x Days to Sell: densidade + faixa de quantis.
+
+    O orçamento é dividido entre as células do heatmap e os pontos da tendência.
+    """
+    days, price = df["Days to Sell"], df["Sale Price"]
+    density_points, trend_points = price_days_budget(max_points)
+    return {
+        "density": density(days, price, density_points),
+        "trend": quantile_series(days, price, trend_points),
+    }
+
+
+def sale_price_histogram(df, max_points=MAX_POINTS):
+    """Histograma pré-agregado dos preços de venda."""
+    return histogram(df["Sale Price"], max_points)
+
+
+def prepare(df, name, max_points=MAX_POINTS):
+    """Dados reduzidos do gráfico ``name`` (ver FIGURES) a partir das linhas de ``df``."""
+    return FIGURES[name][0](df, max_points)
+
+
+def build_figure(name, data):
+    """Figura Plotly ``name`` (ver FIGURES), já validada, a partir dos dados preparados."""
+    return FIGURES[name][1](data)
+
+
+# Nome do gráfico -> (preparação dos dados, construtor em sneakers.charts)
+FIGURES = {
+    "price_days": (price_days, charts.price_days_figure),
+    "sale_price_hist": (sale_price_histogram, charts.histogram_figure),
+}
@@ -0,0 +1,116 @@
+import io
+
+import numpy as np
+
+# As bibliotecas de gráficos são importadas dentro de cada função: só a página
+# (e o gráfico) que usa uma delas paga o custo de importação.
+
+
+def heatmap_png(corr, cmap="coolwarm", fmt=".2f", figsize=(8, 6), dpi=150):
+    """Renderiza o heatmap da matriz de correlação e devolve os bytes do PNG.
+
+    Usa ``Figure`` diretamente em vez de ``plt.subplots``: a figura não entra
+    no registro global do pyplot e é liberada assim que a função termina, então
+    a memória do servidor não cresce a cada rerun.
+    """
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.heatmap(corr, annot=True, cmap=cmap, ax=ax, fmt=fmt)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    fig.clear()
+    return buffer.getvalue()
+
+
+def bernoulli_figure(p_success):
+    """Barras da distribuição de Bernoulli (venda acima ou não do varejo)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=['Venda ≤ Retail', 'Venda > Retail'],
+        y=[1 - p_success, p_success],
+        marker=dict(color=['#d10f45', '#0f1820']),
+        text=[f"{(1 - p_success) * 100:.2f}%", f"{p_success * 100:.2f}%"],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        title="Distribuição de Bernoulli - Vendas acima do preço de varejo",
+        xaxis_title="Resultado",
+        yaxis_title="Probabilidade"
+    )
+    return fig
+
+
+def poisson_figure(k_values, probs, label, lambda_val):
+    """Barras da PMF de Poisson para o grupo selecionado (``label``: marca, ou marca / modelo / região)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=k_values,
+        y=probs,
+        marker=dict(color="#d10f45"),
+        text=[f"{p*100:.2f}%" for p in probs],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        title=f"Distribuição de Poisson para {label} (λ = {lambda_val:.2f})",
+        xaxis_title=f"Número de Vendas ({label})",
+        yaxis_title="Probabilidade"
+    )
+    return fig
+
+
+def price_days_figure(data):
+    """Heatmap de densidade de Sale Price x Days to Sell com a faixa de quantis.
+
+    Recebe os dados já reduzidos por sneakers.chartdata.price_days: o navegador
+    só desenha a grade de contagens e algumas centenas de pontos de linha.
+    """
+    import plotly.graph_objects as go
+
+    x_centers, y_centers, counts = data["density"]
+    trend = data["trend"]
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=x_centers, y=y_centers, z=np.log1p(counts),
+        customdata=counts,
+        colorscale=[[0, "#ffffff"], [1, "#d10f45"]],
+        showscale=False,
+        hovertemplate="Dias: %{x:.0f}<br>Preço: $%{y:.0f}<br>Vendas: %{customdata:,.0f}<extra></extra>",
+    ))
+    for column, name, dash in (("q10", "Percentil 10", "dot"), ("q50", "Mediana", "solid"), ("q90", "Percentil 90", "dot")):
+        fig.add_trace(go.Scatter(
+            x=trend["x"], y=trend[column], mode="lines", name=name,
+            line=dict(color="#0f1820", dash=dash),
+        ))
+    fig.update_layout(
+        title="Preço de venda x dias até a venda",
+        xaxis_title="Dias até a venda",
+        yaxis_title="Preço de venda ($)",
+    )
+    return fig
+
+
+def histogram_figure(hist):
+    """Barras de um histograma pré-agregado (colunas left, right, count)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=(hist["left"] + hist["right"]) / 2,
+        y=hist["count"],
+        width=hist["right"] - hist["left"],
+        marker=dict(color="#d10f45"),
+    ))
+    fig.update_layout(
+        title="Distribuição do preço de venda",
+        xaxis_title="Preço de venda ($)",
+        yaxis_title="Vendas",
+        bargap=0,
+    )
+    return fig
@@ -0,0 +1,93 @@
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+
+import numpy as np
+
+from sneakers import snapshot
+from sneakers.metrics import compute_metrics
+from sneakers.params import POISSON_WINDOW
+
+
+def read_input(path):
+    """Lê um CSV bruto da StockX (via snapshot) ou um Parquet já limpo."""
+    if path.endswith(".parquet"):
+        return snapshot.read_snapshot(path)
+    return snapshot.load(path)
+
+
+def json_ready(value):
+    """Converte o relatório para tipos JSON: escalares numpy viram Python e NaN/inf viram null."""
+    if isinstance(value, dict):
+        return {str(key): json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_ready(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def report_names(paths):
+    """Nome de relatório único por entrada: "vendas.csv" -> "vendas_csv", com sufixo se repetir."""
+    names, used = [], set()
+    for path in paths:
+        base = os.path.basename(path).replace(".", "_")
+        name, i = base, 2
+        while name in used:
+            name, i = f"{base}-{i}", i + 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def write_report(report, output, fmt):
+    """Grava o relatório em JSON (arquivo ou stdout) ou em um diretório de Parquets."""
+    if fmt == "json":
+        text = json.dumps(json_ready(report.to_dict()), indent=2, ensure_ascii=False, allow_nan=False)
+        if output in (None, "-"):
+            sys.stdout.write(text + "\n")
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return
+    if output in (None, "-"):
+        raise SystemExit("--output é obrigatório para o formato parquet")
+    os.makedirs(output, exist_ok=True)
+    for name, frame in report.to_frames().items():
+        frame.to_parquet(os.path.join(output, f"{name}.parquet"), index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m sneakers",
+        description="Calcula as métricas do dashboard em lote, sem Streamlit.",
+    )
+    parser.add_argument("inputs", nargs="+", help="arquivos CSV (StockX) ou Parquet limpos")
+    parser.add_argument("-f", "--format", choices=["json", "parquet"], default="json")
+    parser.add_argument("-o", "--output",
+                        help="arquivo JSON, ou diretório para Parquet; com várias entradas, "
+                             "um diretório onde cada relatório leva o nome do arquivo de entrada "
+                             "(vendas.csv -> vendas_csv)")
+    parser.add_argument("--window", type=int, default=POISSON_WINDOW, help="vendas por janela de Poisson")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if len(args.inputs) > 1 and args.output is None:
+        raise SystemExit("--output é obrigatório com várias entradas")
+    for path, name in zip(args.inputs, report_names(args.inputs)):
+        report = compute_metrics(read_input(path), window=args.window)
+        output = args.output
+        if len(args.inputs) > 1:
+            os.makedirs(output, exist_ok=True)
+            output = os.path.join(output, name + (".json" if args.format == "json" else ""))
+        write_report(report, output, args.format)
+        logging.info("%s: relatório %s gravado", path, args.format)
+
+
+if __name__ == "__main__":
+    main()
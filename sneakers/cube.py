@@ -0,0 +1,119 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from sneakers import snapshot
+from sneakers.data import DATA_PATH
+
+# Incrementar quando as dimensões ou medidas do cubo mudarem
+CUBE_VERSION = 1
+
+# Versão gravada no arquivo: muda também quando a limpeza muda de schema
+STORED_VERSION = f"schema{snapshot.SCHEMA_VERSION}-cube{CUBE_VERSION}"
+
+CUBE_LEVELS = ["Month", "Brand", "Sneaker Name", "Buyer Region"]
+
+# Faixas do histograma de dias para venda: [limite anterior, limite)
+DAYS_EDGES = [-np.inf, 0, 7, 30, 90, 180, 365, np.inf]
+DAYS_COLUMNS = [f"days_{i}" for i in range(len(DAYS_EDGES) - 1)]
+MEASURES = ["count", "price_sum", "price_sumsq", "above"] + DAYS_COLUMNS
+
+
+def cube_path(csv_path=DATA_PATH):
+    """Arquivo do cubo ao lado do CSV de origem."""
+    return os.path.splitext(csv_path)[0] + ".cube.parquet"
+
+
+def build_cube(df):
+    """Agrega as vendas por (mês, marca, modelo, região).
+
+    Cada célula guarda contagem, soma e soma dos quadrados do preço de venda,
+    vendas acima do varejo e o histograma de dias para venda; somar células
+    responde qualquer filtro de período/marca/modelo/região sem ler as linhas.
+    """
+    price = df["Sale Price"].astype(np.float64)
+    days_bin = pd.cut(df["Days to Sell"], DAYS_EDGES, right=False, labels=DAYS_COLUMNS)
+    keys = [df[level] for level in CUBE_LEVELS]
+    measures = pd.DataFrame({
+        "count": 1,
+        "price_sum": price,
+        "price_sumsq": price * price,
+        "above": (df["Sale Price"] > df["Retail Price"]).astype(np.int64),
+    })
+    cube = measures.groupby(keys, observed=True).sum()
+    # Só as combinações que existem: crosstab(dropna=False) montaria o produto
+    # cartesiano de todas as categorias antes do join
+    histogram = (
+        measures.assign(bin=days_bin)
+        .groupby(keys + ["bin"], observed=True).size()
+        .unstack(fill_value=0)
+        .reindex(columns=DAYS_COLUMNS, fill_value=0)
+    )
+    histogram.columns = list(histogram.columns)
+    cube = cube.join(histogram, how="left")
+    cube[DAYS_COLUMNS] = cube[DAYS_COLUMNS].fillna(0).astype(np.int64)
+    return cube.reset_index()
+
+
+def load_cube(csv_path=DATA_PATH, df=None):
+    """Lê o cubo persistido, reconstruindo-o se o CSV mudou.
+
+    Um diretório particionado tem um cubo por partição, somados na leitura.
+    """
+    if os.path.isdir(csv_path):
+        from sneakers.partitions import aggregate_partitions
+
+        return aggregate_partitions(csv_path, "cube", build_cube, CUBE_LEVELS, STORED_VERSION)
+    path = cube_path(csv_path)
+    if snapshot.is_fresh(csv_path, path, version=STORED_VERSION):
+        return pq.read_table(path).to_pandas()
+    cube = build_cube(df if df is not None else snapshot.load(csv_path))
+    snapshot.write_frame(cube, csv_path, path, version=STORED_VERSION, required=False)
+    return cube
+
+
+def select(cube, months=None, brands=None, sneakers=None, regions=None):
+    """Células do cubo dentro do intervalo de meses (inclusivo) e dos filtros."""
+    mask = np.ones(len(cube), dtype=bool)
+    if months is not None:
+        first, last = months
+        mask &= cube["Month"].between(first, last).to_numpy()
+    for level, values in (("Brand", brands), ("Sneaker Name", sneakers), ("Buyer Region", regions)):
+        if values is not None:
+            mask &= cube[level].isin(values).to_numpy()
+    return cube[mask]
+
+
+def totals(cells):
+    """Soma as células: vendas, preço médio e desvio, taxa acima do varejo e histograma."""
+    sums = cells[MEASURES].sum()
+    n = sums["count"]
+    mean = sums["price_sum"] / n if n else np.nan
+    var = (sums["price_sumsq"] - n * mean * mean) / (n - 1) if n > 1 else np.nan
+    return {
+        "count": int(n),
+        "mean_price": float(mean),
+        "std_price": float(np.sqrt(max(var, 0.0))) if n > 1 else np.nan,
+        "above_rate": float(sums["above"] / n) if n else np.nan,
+        "days_histogram": sums[DAYS_COLUMNS].astype(np.int64),
+    }
+
+
+def sales_by(cells, level):
+    """Vendas por valor de um nível, em ordem decrescente."""
+    return cells.groupby(level, observed=True)["count"].sum().sort_values(ascending=False)
+
+
+def best_seller(cells):
+    counts = sales_by(cells, "Sneaker Name")
+    return counts.index[0] if not counts.empty else None
+
+
+if __name__ == "__main__":
+    # Etapa de build: python -m sneakers.cube [arquivo.csv]
+    csv = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    cells = load_cube(csv)
+    print(f"Cubo com {len(cells)} células gravado em {cube_path(csv)}")
@@ -0,0 +1,148 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from sneakers.prices import parse_prices
+
+logger = logging.getLogger(__name__)
+
+# Arquivo padrão com as vendas da StockX (2017-2019); SNEAKERS_DATA pode apontar
+# para outro arquivo ou para um diretório particionado (ver sneakers.partitions)
+DATA_ENV = "SNEAKERS_DATA"
+DATA_PATH = os.environ.get(DATA_ENV, "StockX-Data-Contest-2019-3.csv")
+
+# Schema canônico em memória: strings repetidas como category e números
+# compactos. "Month" é o índice do mês desde 1970-01 (ver month_index).
+CATEGORY_COLUMNS = ["Brand", "Sneaker Name", "Buyer Region"]
+FLOAT_COLUMNS = ["Sale Price", "Retail Price", "Shoe Size", "Price Difference"]
+
+
+def file_signature(path=DATA_PATH):
+    """Retorna (caminho absoluto, mtime em ns, tamanho) do arquivo de dados.
+
+    Para um diretório particionado, o mtime mais recente e o tamanho total das partições.
+    """
+    if os.path.isdir(path):
+        from sneakers.partitions import signature
+
+        return signature(path)
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def month_index(dates):
+    """Meses desde 1970-01 em int16, no lugar de ``dt.to_period('M')``."""
+    return ((dates.dt.year - 1970) * 12 + dates.dt.month - 1).astype(np.int16)
+
+
+def month_start(index):
+    """Converte índices de mês de volta para o primeiro dia do mês."""
+    index = np.asarray(index, dtype=np.int64)
+    return pd.to_datetime({"year": 1970 + index // 12, "month": index % 12 + 1, "day": 1})
+
+
+def month_label(index):
+    """Rótulo "MM/AAAA" de um índice de mês."""
+    index = int(index)
+    return f"{index % 12 + 1:02d}/{1970 + index // 12}"
+
+
+def parse_dates(values):
+    """Converte datas "MM/DD/AA"; valores em branco ou malformados viram NaT.
+
+    Retorna (datas, quantidade de NaT).
+    """
+    dates = pd.to_datetime(values, format="%m/%d/%y", errors="coerce")
+    return dates, int(dates.isna().sum())
+
+
+def parse_columns(df):
+    """Converte as colunas brutas do CSV (datas, preços, categorias) para o schema compacto.
+
+    Altera ``df``; se alguma venda ficar sem "Order Date", o retorno é um novo
+    frame sem essas linhas.
+    """
+    # Datas em branco ou malformadas viram NaT e ficam contadas em df.attrs["invalid_dates"]
+    invalid_dates = {}
+    for column in ("Order Date", "Release Date"):
+        df[column], invalid_dates[column] = parse_dates(df[column])
+    # Preços malformados viram NaN e ficam contados em df.attrs["invalid_prices"]
+    invalid_prices = {}
+    for column in ("Sale Price", "Retail Price"):
+        df[column], invalid_prices[column] = parse_prices(df[column], dtype=np.float32)
+    df["Shoe Size"] = df["Shoe Size"].astype(np.float32)
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+    if "id" in df:
+        df["id"] = df["id"].astype(np.int32)
+    if invalid_dates["Order Date"]:
+        # Sem data do pedido a venda não tem mês nem lugar na ordem por data
+        df = df.drop(index=df.index[df["Order Date"].isna()])
+    df.attrs["invalid_prices"] = invalid_prices
+    df.attrs["invalid_dates"] = invalid_dates
+    return df
+
+
+def derive_columns(df):
+    """Cria as colunas derivadas a partir das colunas já convertidas."""
+    # float32: uma "Release Date" em branco deixa a venda com NaN dias
+    df["Days to Sell"] = (df["Order Date"] - df["Release Date"]).dt.days.astype(np.float32)
+    df["Price Difference"] = df["Sale Price"] - df["Retail Price"]
+    df['Month'] = month_index(df["Order Date"])
+    return df
+
+
+def clean_data(df):
+    """Converte tipos e cria as colunas derivadas usadas pelas páginas."""
+    return derive_columns(parse_columns(df))
+
+
+def profit_margin(df):
+    """Margem de lucro (%) de cada venda sobre o preço de varejo."""
+    if "Profit Margin (%)" in df:
+        return df["Profit Margin (%)"]
+    return ((df['Sale Price'] - df['Retail Price']) / df['Retail Price']) * 100
+
+
+def above_retail(df):
+    """Se cada venda saiu acima do preço de varejo."""
+    if "Above Retail" in df:
+        return df["Above Retail"]
+    return df["Sale Price"] > df["Retail Price"]
+
+
+# Colunas derivadas que não são gravadas no snapshot, calculadas sob demanda
+DERIVED_COLUMNS = {
+    "Profit Margin (%)": profit_margin,
+    "Above Retail": above_retail,
+}
+
+
+def with_derived(df):
+    """Novo frame com as colunas de DERIVED_COLUMNS, sem alterar ``df``.
+
+    As colunas originais são compartilhadas (copy-on-write), só as derivadas
+    ocupam memória nova. profit_margin/above_retail reaproveitam as colunas
+    já presentes, então quem recebe esse frame não as recalcula.
+    """
+    return df.assign(**{name: func(df) for name, func in DERIVED_COLUMNS.items()})
+
+
+def numeric_frame(df):
+    """Colunas numéricas (sem "id" e "Month") mais a margem de lucro, sem alterar ``df``."""
+    numeric = df.select_dtypes(include=['number']).drop(columns=["id", "Month"], errors="ignore")
+    return numeric.assign(**{"Profit Margin (%)": profit_margin(df)})
+
+
+def read_data(path=DATA_PATH):
+    """Lê o CSV bruto e aplica a limpeza, sem nenhum cache."""
+    df = pd.read_csv(path)
+    before = int(df.memory_usage(deep=True).sum())
+    # Ordenado por data: filtros de período viram busca binária (ver sneakers.index)
+    df = clean_data(df).sort_values("Order Date", kind="stable", ignore_index=True)
+    after = int(df.memory_usage(deep=True).sum())
+    df.attrs["memory_usage"] = {"raw": before, "clean": after}
+    logger.info("%s: %.1f MB brutos -> %.1f MB no schema compacto", path, before / 1e6, after / 1e6)
+    return df
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+# Permissão dos arquivos publicados: a mesma de um open() comum (mkstemp cria com 0600).
+# Lida uma vez na importação, porque os.umask só pode ser consultado alterando-o.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, write, required=True):
+    """Grava ``path`` com ``write(tmp_path)`` em um arquivo temporário e troca atomicamente.
+
+    Outro worker nunca lê um arquivo pela metade. Cada gravação tem o seu
+    próprio temporário (mkstemp, no diretório de ``path``), então threads e
+    processos que gravam o mesmo arquivo ao mesmo tempo não se atrapalham: o
+    último ``os.replace`` vence. Com ``required=False``, um OSError (diretório
+    somente leitura, disco cheio) não é propagado: os arquivos derivados
+    (snapshot, cubo, manifesto) são só um atalho e o chamador segue com o
+    valor já calculado. Retorna se o arquivo foi gravado.
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=f".{os.path.basename(path)}.", suffix=".tmp",
+        )
+        os.close(fd)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        _remove(tmp_path)
+        if required:
+            raise
+        return False
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    return True
+
+
+def _remove(path):
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
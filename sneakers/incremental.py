@@ -0,0 +1,190 @@
+import io
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+from sneakers import snapshot
+from sneakers.aggregates import SUMMARY_COLUMNS, Aggregates
+from sneakers.cube import CUBE_LEVELS, build_cube
+from sneakers.data import DATA_PATH, clean_data, numeric_frame
+from sneakers.files import atomic_write
+from sneakers.params import GROUP_LEVELS, group_counts
+from sneakers.partitions import sum_aggregates
+from sneakers.sketch import QuantileSketch
+from sneakers.streaming import CSV_DTYPES, DEFAULT_CHUNKSIZE, stream_aggregates
+
+# Incrementar quando os campos de Aggregates ou do estado mudarem
+STATE_VERSION = 4
+
+# ε dos sketches das linhas do delta: o menor oferecido pela página de
+# exploração, então a combinação com o sketch do CSV vale para qualquer ε dela
+DELTA_SKETCH_EPS = 0.001
+
+
+class IncrementalState:
+    """Agregados persistidos mais o quanto de cada arquivo de delta já foi lido.
+
+    Os deltas são CSVs só de acréscimo (mesmo cabeçalho do arquivo principal);
+    ``offsets`` guarda a posição em bytes já consumida de cada um, então cada
+    atualização lê apenas as linhas novas. ``delta_counts`` e ``delta_cube``
+    são as contagens por grupo (sneakers.params) e as células do cubo
+    (sneakers.cube) só das linhas dos deltas, que o loader soma às do CSV
+    principal; None enquanto nenhum delta foi lido. ``delta_sketches`` são os
+    sketches de quantis dessas linhas (um por coluna resumida), combinados
+    pelo loader com os do CSV no modo de mediana aproximada.
+    """
+
+    def __init__(self, aggregates=None, offsets=None, source=None):
+        self.version = STATE_VERSION
+        self.aggregates = aggregates or Aggregates()
+        self.offsets = offsets or {}
+        # Metadados do CSV principal (ver snapshot.source_metadata)
+        self.source = source
+        self.delta_counts = None
+        self.delta_cube = None
+        self.delta_sketches = {
+            column: QuantileSketch(DELTA_SKETCH_EPS, seed=i) for i, column in enumerate(SUMMARY_COLUMNS)
+        }
+
+    def add_delta(self, chunk):
+        """Acumula um bloco do delta já limpo por ``clean_data``."""
+        self.aggregates.update(chunk)
+        numeric = numeric_frame(chunk)
+        for column, sketch in self.delta_sketches.items():
+            sketch.update(numeric[column].to_numpy())
+        self.delta_counts = _add_cells(self.delta_counts, group_counts(chunk), GROUP_LEVELS)
+        self.delta_cube = _add_cells(self.delta_cube, build_cube(chunk), CUBE_LEVELS)
+
+
+def _add_cells(total, part, levels):
+    return part if total is None else sum_aggregates([total, part], levels)
+
+
+def state_path(csv_path=DATA_PATH):
+    """Arquivo de estado ao lado do CSV principal."""
+    return os.path.splitext(csv_path)[0] + ".state.pkl"
+
+
+def delta_path(csv_path=DATA_PATH):
+    """Delta só de acréscimo ao lado do CSV principal ("vendas.csv" -> "vendas.delta.csv").
+
+    Ele traz apenas as linhas que ainda não estão no CSV principal.
+    """
+    return os.path.splitext(csv_path)[0] + ".delta.csv"
+
+
+def save_state(state, path, required=True):
+    """Grava o estado; com ``required=False``, uma falha só faz retornar False (ver files.atomic_write)."""
+    return atomic_write(path, lambda tmp_path: _dump_state(state, tmp_path), required=required)
+
+
+def _dump_state(state, path):
+    with open(path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_state(path, csv_path=DATA_PATH):
+    """Estado salvo, ou None se não existir, for de outra versão ou de outro CSV principal.
+
+    O CSV é conferido como nos snapshots: se só mtime/tamanho mudaram e o
+    conteúdo é o mesmo, os metadados do estado são atualizados.
+    """
+    return _load_state(path, csv_path)[0]
+
+
+def _load_state(path, csv_path):
+    # (estado ou None, se os metadados do CSV foram atualizados e o estado deve ser regravado)
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except FileNotFoundError:
+        return None, False
+    if getattr(state, "version", None) != STATE_VERSION:
+        return None, False
+    current = snapshot.check_source(state.source, csv_path, STATE_VERSION)
+    if current is None:
+        return None, False
+    touched = current is not state.source
+    state.source = current
+    return state, touched
+
+
+def build_state(csv_path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Estado inicial a partir do histórico completo (feito uma única vez)."""
+    source = snapshot.source_metadata(csv_path, STATE_VERSION)
+    return IncrementalState(stream_aggregates(csv_path, chunksize), source=source)
+
+
+def apply_delta(state, delta_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Acumula no estado apenas as linhas do delta ainda não processadas.
+
+    Retorna a quantidade de linhas novas. Uma linha final incompleta (arquivo
+    ainda sendo escrito) fica para a próxima chamada.
+    """
+    key = os.path.abspath(delta_path)
+    with open(delta_path, "rb") as f:
+        header = f.readline()
+        offset = max(state.offsets.get(key, 0), f.tell())
+        f.seek(offset)
+        data = f.read()
+    complete = data.rfind(b"\n") + 1
+    if complete == 0:
+        return 0
+
+    names = pd.read_csv(io.BytesIO(header)).columns.tolist()
+    new_rows = 0
+    with pd.read_csv(io.BytesIO(data[:complete]), names=names, header=None,
+                     dtype=CSV_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            state.add_delta(clean_data(chunk))
+            new_rows += len(chunk)
+    state.offsets[key] = offset + complete
+    return new_rows
+
+
+def read_delta(delta_path):
+    """Linhas completas do delta, já limpas por ``clean_data``, ou None se ainda não houver nenhuma."""
+    with open(delta_path, "rb") as f:
+        data = f.read()
+    complete = data.rfind(b"\n") + 1
+    if complete == 0:
+        return None
+    rows = pd.read_csv(io.BytesIO(data[:complete]), dtype=CSV_DTYPES)
+    return clean_data(rows) if len(rows) else None
+
+
+def refresh(csv_path=DATA_PATH, delta_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Carrega (ou cria) o estado, aplica o delta e salva; retorna o estado.
+
+    O arquivo só é regravado quando o estado mudou (novo, metadados do CSV
+    atualizados ou delta avançado). Uma falha de gravação (diretório somente
+    leitura, disco cheio) não impede o uso do estado já calculado em memória.
+    """
+    path = state_path(csv_path)
+    state, changed = _load_state(path, csv_path)
+    if (state is not None and delta_path is not None
+            and os.path.getsize(delta_path) < state.offsets.get(os.path.abspath(delta_path), 0)):
+        # Delta menor do que o já lido: foi trocado, e as linhas antigas não saem dos agregados
+        state = None
+    if state is None:
+        state = build_state(csv_path, chunksize)
+        changed = True
+    if delta_path is not None:
+        offsets = dict(state.offsets)
+        apply_delta(state, delta_path, chunksize)
+        changed = changed or state.offsets != offsets
+    if changed:
+        save_state(state, path, required=False)
+    return state
+
+
+if __name__ == "__main__":
+    # Uso: python -m sneakers.incremental [arquivo.csv] [delta.csv]
+    csv = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    delta = sys.argv[2] if len(sys.argv) > 2 else None
+    result = refresh(csv, delta).aggregates
+    print(f"Linhas agregadas: {result.n_rows}")
+    print(f"Tênis mais vendido: {result.best_seller}")
+    print(f"Vendas acima do varejo: {result.above_retail_rate:.2%}")
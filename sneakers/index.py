@@ -0,0 +1,137 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Colunas com índice de grupo (valor -> posições das linhas)
+INDEX_LEVELS = ["Brand", "Sneaker Name", "Buyer Region"]
+
+
+def _positions(dates, start=None, end=None):
+    # Limites [lo, hi) das linhas com start <= data <= end numa coluna ordenada
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left"))
+    hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right"))
+    return lo, max(lo, hi)
+
+
+def date_slice(df, start=None, end=None, assume_sorted=False):
+    """Linhas com ``start <= Order Date <= end``.
+
+    Com ``assume_sorted=True`` (frame já ordenado por data, como o do loader)
+    é só busca binária. Sem isso, a ordenação é conferida, o que custa uma
+    passada: para filtros repetidos no mesmo frame use ``SalesIndex``, que
+    confere uma única vez.
+    """
+    dates = df["Order Date"]
+    if assume_sorted or dates.is_monotonic_increasing:
+        lo, hi = _positions(dates.to_numpy(), start, end)
+        return df.iloc[lo:hi]
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (dates >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (dates <= pd.Timestamp(end)).to_numpy()
+    return df[mask]
+
+
+def year_bounds(first, last):
+    """(início de ``first``, fim de ``last``) como timestamps inclusivos."""
+    return (pd.Timestamp(year=first, month=1, day=1),
+            pd.Timestamp(year=last + 1, month=1, day=1) - pd.Timedelta(1, "ns"))
+
+
+def year_slice(df, first, last, assume_sorted=False):
+    """Linhas com pedidos entre o início de ``first`` e o fim de ``last``."""
+    return date_slice(df, *year_bounds(first, last), assume_sorted=assume_sorted)
+
+
+def _codes(values):
+    # Códigos compactos (-1 = ausente) e valores de cada código: os de uma coluna
+    # categórica são reaproveitados; as demais são fatoradas
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.min_scalar_type(-len(uniques) - 1)), uniques
+
+
+class SalesIndex:
+    """Caminhos de acesso a um frame ordenado por "Order Date".
+
+    Intervalos de datas viram busca binária e filtros por marca, modelo ou
+    região usam as posições pré-calculadas de cada grupo, então o custo
+    depende do tamanho do resultado e não do frame inteiro.
+    """
+
+    def __init__(self, df, levels=INDEX_LEVELS, assume_sorted=False):
+        # ``levels``: só as colunas que serão filtradas (ex.: ("Brand",) para uma partição)
+        if not assume_sorted and not df["Order Date"].is_monotonic_increasing:
+            raise ValueError("SalesIndex exige o frame ordenado por 'Order Date'")
+        self.df = df
+        self.dates = df["Order Date"].to_numpy()
+        self.codes = {}
+        self.lookup = {}
+        self.order = {}
+        self.offsets = {}
+        position_dtype = np.int32 if len(df) <= np.iinfo(np.int32).max else np.int64
+        for level in levels:
+            codes, uniques = _codes(df[level])
+            self.codes[level] = codes
+            self.lookup[level] = {value: code for code, value in enumerate(uniques)}
+            # Uma ordenação estável dos códigos agrupa as posições de cada valor, já em
+            # ordem crescente; o grupo ``code`` é order[offsets[code]:offsets[code + 1]]
+            self.order[level] = np.argsort(codes, kind="stable").astype(position_dtype)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            self.offsets[level] = np.concatenate(([0], np.cumsum(counts))) + np.count_nonzero(codes < 0)
+
+    def owned_nbytes(self):
+        """Bytes dos códigos e posições por grupo; o frame e as datas são do loader."""
+        return sum(self.codes[level].nbytes + self.order[level].nbytes + self.offsets[level].nbytes
+                   + sys.getsizeof(self.lookup[level]) for level in self.codes)
+
+    def group(self, level, code):
+        """Posições (crescentes) das linhas com o valor de código ``code`` em ``level``."""
+        offsets = self.offsets[level]
+        return self.order[level][offsets[code]:offsets[code + 1]]
+
+    def date_range(self, start=None, end=None):
+        """``slice`` das linhas com start <= data <= end."""
+        return slice(*_positions(self.dates, start, end))
+
+    def rows(self, start=None, end=None, brand=None, sneaker=None, region=None):
+        """Posições (ordenadas) das linhas que atendem a todos os filtros.
+
+        Parte do menor grupo pedido, recortado ao intervalo de datas por busca
+        binária, e confere os demais filtros só nessas posições.
+        """
+        window = self.date_range(start, end)
+        filters = [(level, value) for level, value in
+                   (("Brand", brand), ("Sneaker Name", sneaker), ("Buyer Region", region)) if value is not None]
+        if not filters:
+            return np.arange(window.start, window.stop)
+
+        empty = np.empty(0, dtype=np.intp)
+        wanted = [(level, self.lookup[level].get(value)) for level, value in filters]
+        if any(code is None for _, code in wanted):
+            return empty
+        wanted.sort(key=lambda item: len(self.group(*item)))
+        (level, code), others = wanted[0], wanted[1:]
+        positions = self.group(level, code)
+        lo, hi = np.searchsorted(positions, [window.start, window.stop])
+        positions = positions[lo:hi]
+        for level, code in others:
+            positions = positions[self.codes[level][positions] == code]
+        return positions
+
+    def select(self, years=None, brands=None):
+        """Sub-frame dos anos ``(primeiro, último)`` e de qualquer uma das marcas ``brands``."""
+        start, end = year_bounds(*years) if years is not None else (None, None)
+        if brands is None:
+            return self.df.iloc[self.date_range(start, end)]
+        positions = [self.rows(start, end, brand=brand) for brand in brands]
+        return self.df.iloc[np.sort(np.concatenate(positions)) if positions else []]
+
+    def filter(self, start=None, end=None, brand=None, sneaker=None, region=None):
+        """Sub-frame com as linhas de ``rows``; apenas intervalo de datas vira fatia sem cópia."""
+        if brand is None and sneaker is None and region is None:
+            return self.df.iloc[self.date_range(start, end)]
+        return self.df.iloc[self.rows(start, end, brand, sneaker, region)]
@@ -0,0 +1,250 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from sneakers.files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Arquivo no formato texto do Prometheus, reescrito ao fim de cada execução
+METRICS_FILE_ENV = "SNEAKERS_METRICS_FILE"
+
+# Ativa o painel de depuração na barra lateral (também via ?debug=1 na URL)
+DEBUG_ENV = "SNEAKERS_DEBUG"
+
+_local = threading.local()
+_lock = threading.Lock()
+_stage_calls = Counter()
+_stage_seconds = defaultdict(float)
+_cache_calls = Counter()
+_cache_misses = Counter()
+_reruns = Counter()
+
+
+def _rss_bytes():
+    """Memória residente atual do processo (0 se indisponível)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+
+def current_run():
+    """Registro da execução em andamento nesta thread, ou None."""
+    return getattr(_local, "run", None)
+
+
+def start_run(page):
+    """Inicia o registro de uma execução (rerun) da página."""
+    _local.run = {
+        "page": page,
+        "started": time.time(),
+        "t0": time.perf_counter(),
+        "rss_start": _rss_bytes(),
+        "stages": [],
+        "cache": defaultdict(lambda: {"calls": 0, "misses": 0}),
+    }
+    return _local.run
+
+
+@contextmanager
+def stage(name):
+    """Mede tempo e variação de memória de um trecho da página."""
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        rss_delta = _rss_bytes() - rss_before
+        run = current_run()
+        if run is not None:
+            run["stages"].append({"stage": name, "seconds": seconds, "rss_delta": rss_delta})
+        with _lock:
+            _stage_calls[name] += 1
+            _stage_seconds[name] += seconds
+
+
+def cache_call(name):
+    """Conta uma consulta a um cache (ver ``counted``)."""
+    with _lock:
+        _cache_calls[name] += 1
+    run = current_run()
+    if run is not None:
+        run["cache"][name]["calls"] += 1
+
+
+def counted(name, label_arg=None):
+    """Decorador das funções cacheadas: conta uma consulta a cada entrada na função.
+
+    Aplicado por fora do decorador de cache, conta também as chamadas internas
+    entre caches (ex.: o cubo pedindo o backend), que ``cache_build`` conta como
+    faltas. Com ``label_arg``, o argumento nessa posição completa o nome
+    ("section:columns"). Preserva o ``clear()`` da função cacheada.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            cache_call(name if label_arg is None else f"{name}:{args[label_arg]}")
+            return fn(*args)
+
+        wrapper.clear = fn.clear
+        return wrapper
+    return decorator
+
+
+def cache_miss(name):
+    """Conta uma falta de cache (chamar dentro do corpo da função cacheada)."""
+    with _lock:
+        _cache_misses[name] += 1
+    run = current_run()
+    if run is not None:
+        run["cache"][name]["misses"] += 1
+
+
+@contextmanager
+def cache_build(name):
+    """Conta uma falta de cache e mede a construção do valor (corpo da função cacheada)."""
+    cache_miss(name)
+    with stage(f"cache:{name}"):
+        yield
+
+
+def prometheus_text():
+    """Métricas acumuladas do processo no formato texto do Prometheus."""
+    with _lock:
+        stage_calls, stage_seconds = dict(_stage_calls), dict(_stage_seconds)
+        cache_calls, cache_misses, reruns = dict(_cache_calls), dict(_cache_misses), dict(_reruns)
+    lines = [
+        "# HELP sneakers_stage_seconds_total Tempo gasto em cada etapa das páginas.",
+        "# TYPE sneakers_stage_seconds_total counter",
+    ]
+    lines += [f'sneakers_stage_seconds_total{{stage="{name}"}} {value:.6f}' for name, value in sorted(stage_seconds.items())]
+    lines += [
+        "# HELP sneakers_stage_calls_total Execuções de cada etapa.",
+        "# TYPE sneakers_stage_calls_total counter",
+    ]
+    lines += [f'sneakers_stage_calls_total{{stage="{name}"}} {value}' for name, value in sorted(stage_calls.items())]
+    lines += [
+        "# HELP sneakers_cache_requests_total Consultas aos caches do loader, por resultado.",
+        "# TYPE sneakers_cache_requests_total counter",
+    ]
+    for name in sorted(cache_calls.keys() | cache_misses.keys()):
+        misses = cache_misses.get(name, 0)
+        lines.append(f'sneakers_cache_requests_total{{cache="{name}",result="hit"}} {max(cache_calls.get(name, 0) - misses, 0)}')
+        lines.append(f'sneakers_cache_requests_total{{cache="{name}",result="miss"}} {misses}')
+    lines += [
+        "# HELP sneakers_reruns_total Execuções de cada página ou fragmento (página:fragmento).",
+        "# TYPE sneakers_reruns_total counter",
+    ]
+    lines += [f'sneakers_reruns_total{{page="{name}"}} {value}' for name, value in sorted(reruns.items())]
+    lines += [
+        "# HELP sneakers_process_resident_memory_bytes Memória residente do processo.",
+        "# TYPE sneakers_process_resident_memory_bytes gauge",
+        f"sneakers_process_resident_memory_bytes {_rss_bytes()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    text = prometheus_text()
+    atomic_write(path, lambda tmp_path: _write_text(text, tmp_path))
+
+
+def _write_text(text, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def debug_enabled():
+    if os.environ.get(DEBUG_ENV):
+        return True
+    import streamlit as st
+
+    return st.query_params.get("debug") in ("1", "true")
+
+
+def render_debug_panel(run, sidebar=True):
+    """Painel opcional com as etapas e os caches desta execução.
+
+    Fica na barra lateral; com ``sidebar=False``, no próprio corpo (um
+    fragmento não pode escrever fora dele).
+    """
+    import pandas as pd
+    import streamlit as st
+
+    parent = st.sidebar if sidebar else st
+    with parent.expander(f"Depuração: tempos desta execução ({run['page']})", expanded=True):
+        st.write(f"Total: **{run['seconds'] * 1e3:.1f} ms** · memória {run['rss_delta'] / 1e6:+.1f} MB")
+        if run["stages"]:
+            stages = pd.DataFrame(run["stages"])
+            stages["ms"] = stages.pop("seconds") * 1e3
+            stages["MB"] = stages.pop("rss_delta") / 1e6
+            st.dataframe(stages, hide_index=True)
+        if run["cache"]:
+            caches = pd.DataFrame([
+                {"cache": name, "hits": max(c["calls"] - c["misses"], 0), "misses": c["misses"]}
+                for name, c in run["cache"].items()
+            ])
+            st.dataframe(caches, hide_index=True)
+
+
+def finish_run(sidebar=True):
+    """Fecha o registro da execução: log estruturado, arquivo Prometheus e painel (ver render_debug_panel)."""
+    run = current_run()
+    if run is None:
+        return None
+    run["seconds"] = time.perf_counter() - run.pop("t0")
+    run["rss_delta"] = _rss_bytes() - run.pop("rss_start")
+    run["cache"] = dict(run["cache"])
+    with _lock:
+        _reruns[run["page"]] += 1
+    logger.info(json.dumps({"event": "rerun", **run}))
+
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        try:
+            write_prometheus(path)
+        except OSError:
+            logger.warning("Não foi possível gravar as métricas em %s", path)
+    if debug_enabled():
+        render_debug_panel(run, sidebar=sidebar)
+    _local.run = None
+    return run
+
+
+def fragment_run(page):
+    """Decorador das funções ``@st.fragment`` (aplicado por dentro dele).
+
+    Quando o fragmento roda sozinho (interação com um widget dele), não há
+    execução da página em andamento: o decorador abre e fecha uma execução
+    "página:fragmento", com tempos, log, Prometheus e painel de depuração.
+    Dentro de uma execução completa da página, só chama a função.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_run() is not None:
+                return fn(*args, **kwargs)
+            start_run(f"{page}:{fn.__name__}")
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                # Rerun/stop do Streamlit ou erro: a execução não é registrada
+                _local.run = None
+                raise
+            finish_run(sidebar=False)
+            return result
+        return wrapper
+    return decorator
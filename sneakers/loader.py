@@ -0,0 +1,348 @@
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from sneakers import chartdata, charts, cube, incremental, instrument, partitions, snapshot
+from sneakers.backends import BACKEND_ENV, DEFAULT_BACKEND, open_backend
+from sneakers.data import DATA_PATH, file_signature, with_derived
+from sneakers.index import SalesIndex
+from sneakers.params import GROUP_LEVELS, ParamTable, load_group_counts
+from sneakers.partitions import sum_aggregates
+from sneakers.simulation import DEFAULT_SEED, simulate_bernoulli
+from sneakers.sketch import merge_sketches
+from sneakers.stats import summary_from_aggregates
+from sneakers.store import STORE
+
+
+# Última versão vista de cada caminho (ver _signature)
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _signature(path):
+    """file_signature de ``path``; numa versão nova, descarta do store os resultados das antigas.
+
+    O índice e o backend pandas referenciam o frame derivado da sua versão e
+    o store os mede sem ele: se ficassem guardados, o frame antigo continuaria
+    vivo fora do orçamento de bytes do store.
+    """
+    signature = file_signature(path)
+    with _versions_lock:
+        previous = _versions.get(signature[0])
+        _versions[signature[0]] = signature
+    if previous is not None and previous != signature:
+        STORE.discard(lambda key: key[1] == signature[0] and tuple(key[1:4]) != signature)
+    return signature
+
+
+# Um único DataFrame por versão do arquivo, compartilhado entre todas as sessões.
+# A chave (caminho, mtime, tamanho) faz com que uma nova exportação seja relida
+# automaticamente; max_entries=2 guarda no máximo a versão atual e a anterior.
+# A leitura passa pelo snapshot Parquet, que só é refeito quando o CSV muda.
+@instrument.counted("data")
+@st.cache_resource(max_entries=2, show_spinner="Carregando dados...")
+def _load_cached(path, mtime_ns, size):
+    with instrument.cache_build("data"):
+        return snapshot.load(path)
+
+
+def load_data(path=DATA_PATH):
+    """Retorna o DataFrame limpo e compartilhado do processo.
+
+    O objeto é o mesmo para todas as sessões: trate-o como somente leitura e
+    use ``df.copy()`` antes de criar ou alterar colunas.
+    """
+    return _load_cached(*_signature(path))
+
+
+# O frame com as colunas derivadas fica fora do store: é grande e compartilhado
+# pelo backend, pelo índice e pelos gráficos, que guardam no store só o que é
+# deles. Como em _load_cached, max_entries=2 guarda no máximo duas versões, mas
+# o frame antigo só é liberado quando nenhum resultado do store o referencia
+# mais: _signature descarta os resultados de uma versão assim que ela é trocada.
+@instrument.counted("derived")
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _derived_cached(path, mtime_ns, size):
+    with instrument.cache_build("derived"):
+        return with_derived(_load_cached(path, mtime_ns, size))
+
+
+def load_derived(path=DATA_PATH):
+    """Frame compartilhado com as colunas derivadas (margem de lucro, acima do varejo).
+
+    Calculadas uma vez por versão do arquivo; somente leitura, como load_data.
+    """
+    return _derived_cached(*_signature(path))
+
+
+@instrument.counted("index")
+@STORE.cached("index")
+def _index_cached(path, mtime_ns, size):
+    with instrument.cache_build("index"):
+        return SalesIndex(_derived_cached(path, mtime_ns, size))
+
+
+def load_index(path=DATA_PATH):
+    """Índices de data e de grupo sobre o frame compartilhado (ordenado por data).
+
+    Os filtros de período e marca do loader passam por ele.
+    """
+    return _index_cached(*_signature(path))
+
+
+@instrument.counted("slice")
+@STORE.cached("slice")
+def _slice_cached(path, mtime_ns, size, years, brands):
+    with instrument.cache_build("slice"):
+        if os.path.isdir(path):
+            # Diretório particionado: só as partições que podem ter essas linhas são lidas
+            return with_derived(partitions.read_partitions(path, years=years, brands=brands))
+        return _index_cached(path, mtime_ns, size).select(years, brands)
+
+
+def load_slice(years=None, brands=None, path=DATA_PATH):
+    """Vendas dos anos ``(primeiro, último)`` e das marcas pedidas, com as colunas derivadas.
+
+    Com um diretório particionado, o custo acompanha o tamanho da consulta e
+    não o do arquivo inteiro.
+    """
+    brands = None if brands is None else tuple(sorted(brands))
+    return _slice_cached(*_signature(path), None if years is None else tuple(years), brands)
+
+
+@instrument.counted("backend", label_arg=3)
+@STORE.cached("backend")
+def _backend_cached(path, mtime_ns, size, name):
+    with instrument.cache_build(f"backend:{name}"):
+        # O backend pandas reaproveita o frame compartilhado; o DuckDB não carrega as linhas
+        if name == "pandas":
+            return open_backend(path, name, df=_derived_cached(path, mtime_ns, size),
+                                index=_index_cached(path, mtime_ns, size))
+        return open_backend(path, name)
+
+
+def _backend_name():
+    return os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+
+
+def load_backend(path=DATA_PATH):
+    """Backend de consulta das métricas (SNEAKERS_BACKEND: "pandas", padrão, ou "duckdb").
+
+    Resumos, seções, parâmetros e cubo passam por ele, com os resultados no store.
+    """
+    name = _backend_name()
+    return _backend_cached(*_signature(path), name)
+
+
+def _delta_signature(path):
+    # (mtime, tamanho) do delta só de acréscimo ao lado do CSV, ou None se não houver
+    delta = incremental.delta_path(path)
+    if os.path.isdir(path) or not os.path.exists(delta):
+        return None
+    return file_signature(delta)[1:]
+
+
+@instrument.counted("incremental")
+@STORE.cached("incremental")
+def _incremental_cached(path, mtime_ns, size, delta):
+    with instrument.cache_build("incremental"):
+        # O estado persistido (<csv>.state.pkl) só lê as linhas do delta ainda não processadas
+        return incremental.refresh(path, None if delta is None else incremental.delta_path(path))
+
+
+def load_aggregates(path=DATA_PATH):
+    """Agregados incrementais do CSV principal mais o delta ``<csv>.delta.csv``.
+
+    Cada acréscimo ao delta muda a chave e custa só as linhas novas.
+    """
+    return _incremental_cached(*_signature(path), _delta_signature(path)).aggregates
+
+
+# Os resultados derivados abaixo ficam no store compartilhado (sneakers.store):
+# LRU limitado por tamanho, com um único cálculo por chave mesmo quando várias
+# sessões chegam juntas com o cache frio.
+@instrument.counted("summary")
+@STORE.cached("summary")
+def _summary_cached(path, mtime_ns, size, backend, delta):
+    with instrument.cache_build("summary"):
+        if delta is not None:
+            # Com delta, o resumo vem do estado incremental: histórico + linhas novas
+            return summary_from_aggregates(_incremental_cached(path, mtime_ns, size, delta).aggregates)
+        return _backend_cached(path, mtime_ns, size, backend).summary()
+
+
+def load_summary(path=DATA_PATH):
+    """Estatísticas da página de exploração, calculadas uma vez por versão do arquivo.
+
+    Se existir um delta ``<csv>.delta.csv``, incluem as linhas dele (ver load_aggregates).
+    """
+    return _summary_cached(*_signature(path), _backend_name(), _delta_signature(path))
+
+
+@instrument.counted("section", label_arg=5)
+@STORE.cached("section")
+def _section_cached(path, mtime_ns, size, backend, delta, section):
+    with instrument.cache_build(f"section:{section}"):
+        if delta is not None:
+            # As seções são campos de SummaryStats com o mesmo nome; "moments" usa as colunas,
+            # cujas medianas vêm das contagens de valores sem custo extra
+            summary = _summary_cached(path, mtime_ns, size, backend, delta)
+            return getattr(summary, "columns" if section == "moments" else section)
+        return _backend_cached(path, mtime_ns, size, backend).section(section)
+
+
+def load_section(section, path=DATA_PATH):
+    """Resultado de uma única seção de sneakers.stats.SECTIONS ("best_seller", "columns", "moments", "corr").
+
+    Cada seção é calculada apenas quando pedida pela primeira vez para a versão
+    atual do arquivo (e do delta, se houver, como em load_summary).
+    """
+    return _section_cached(*_signature(path), _backend_name(), _delta_signature(path), section)
+
+
+@instrument.counted("sketches")
+@STORE.cached("sketches")
+def _sketches_cached(path, mtime_ns, size, backend, delta, eps):
+    with instrument.cache_build("sketches"):
+        if delta is not None:
+            # Com delta, os sketches do CSV (em cache, sem delta) combinados com os das
+            # linhas novas, mantidos no estado incremental: cada acréscimo custa só o delta
+            sketches = _sketches_cached(path, mtime_ns, size, backend, None, eps)
+            state = _incremental_cached(path, mtime_ns, size, delta)
+            return {column: merge_sketches([sketch, state.delta_sketches[column]], eps)
+                    for column, sketch in sketches.items()}
+        return _backend_cached(path, mtime_ns, size, backend).sketches(eps)
+
+
+def load_sketches(eps, path=DATA_PATH):
+    """Sketches de quantis por coluna resumida, para o modo de mediana aproximada.
+
+    Incluem as linhas do delta ``<csv>.delta.csv``, se houver, como load_summary.
+    """
+    return _sketches_cached(*_signature(path), _backend_name(), _delta_signature(path), eps)
+
+
+@instrument.counted("heatmap")
+@STORE.cached("heatmap")
+def _heatmap_cached(path, mtime_ns, size, backend, delta, cmap, fmt, figsize, dpi):
+    with instrument.cache_build("heatmap"):
+        corr = _section_cached(path, mtime_ns, size, backend, delta, "corr")
+        return charts.heatmap_png(corr, cmap=cmap, fmt=fmt, figsize=figsize, dpi=dpi)
+
+
+def load_heatmap(cmap="coolwarm", fmt=".2f", figsize=(8, 6), dpi=150, path=DATA_PATH):
+    """PNG do heatmap de correlação, renderizado uma vez por versão do arquivo e parâmetros."""
+    return _heatmap_cached(*_signature(path), _backend_name(), _delta_signature(path),
+                           cmap, fmt, tuple(figsize), dpi)
+
+
+@instrument.counted("chart", label_arg=5)
+@STORE.cached("chart")
+def _chart_cached(path, mtime_ns, size, backend, delta, name, max_points, brand):
+    with instrument.cache_build(f"chart:{name}"):
+        if delta is not None or (backend == "pandas" and os.path.isdir(path)):
+            # Diretório particionado: as linhas de uma marca vêm de load_slice, que só lê
+            # as partições dessa marca; o backend pandas leria todas pelo frame compartilhado
+            rows = _derived_cached(path, mtime_ns, size) if brand is None else _slice_cached(
+                path, mtime_ns, size, None, (brand,))
+            delta_rows = None if delta is None else incremental.read_delta(incremental.delta_path(path))
+            if delta_rows is not None:
+                # Com delta, a densidade e os quantis não se somam por partes como as
+                # contagens: as linhas novas entram no frame antes da redução, em qualquer backend
+                if brand is not None:
+                    delta_rows = delta_rows[delta_rows["Brand"] == brand]
+                rows = pd.concat([rows, with_derived(delta_rows)], ignore_index=True)
+            data = chartdata.prepare(rows, name, max_points)
+        else:
+            data = _backend_cached(path, mtime_ns, size, backend).chart_data(name, max_points, brand)
+        return chartdata.build_figure(name, data)
+
+
+def load_chart(name, max_points=chartdata.MAX_POINTS, brand=None, path=DATA_PATH):
+    """Figura Plotly ``name`` (ver sneakers.chartdata.FIGURES), já reduzida ao orçamento de pontos.
+
+    Os dados vêm do backend (no DuckDB, agregados em SQL; com um diretório
+    particionado e o pandas, das partições da marca) e a figura é montada
+    e validada uma vez por versão do arquivo, orçamento e marca (None = todas);
+    as sessões recebem o mesmo ``go.Figure``, que o st.plotly_chart usa sem
+    validar de novo. Inclui as linhas do delta ``<csv>.delta.csv``, se houver,
+    como load_summary. Somente leitura.
+    """
+    return _chart_cached(*_signature(path), _backend_name(), _delta_signature(path), name, max_points, brand)
+
+
+@instrument.counted("params")
+@STORE.cached("params")
+def _params_cached(path, mtime_ns, size, backend, delta):
+    with instrument.cache_build("params"):
+        if os.path.isdir(path):
+            # Diretório particionado: contagens guardadas por partição, sem ler as vendas
+            return ParamTable.from_counts(load_group_counts(path))
+        counts = _backend_cached(path, mtime_ns, size, backend).group_counts()
+        state = None if delta is None else _incremental_cached(path, mtime_ns, size, delta)
+        if state is not None and state.delta_counts is not None:
+            # Com delta, as contagens das linhas novas (estado incremental) somam às do CSV
+            counts = sum_aggregates([counts, state.delta_counts], GROUP_LEVELS)
+        return ParamTable.from_counts(counts)
+
+
+def load_params(path=DATA_PATH):
+    """Tabela de parâmetros de Bernoulli/Poisson por grupo, uma vez por versão do arquivo.
+
+    Inclui as linhas do delta ``<csv>.delta.csv``, se houver, como load_summary.
+    """
+    return _params_cached(*_signature(path), _backend_name(), _delta_signature(path))
+
+
+@instrument.counted("cube")
+@STORE.cached("cube")
+def _cube_cached(path, mtime_ns, size, backend, delta):
+    with instrument.cache_build("cube"):
+        if os.path.isdir(path):
+            # Diretório particionado: soma dos cubos por partição, sem ler as vendas
+            return cube.load_cube(path)
+        cells = _backend_cached(path, mtime_ns, size, backend).cube()
+        state = None if delta is None else _incremental_cached(path, mtime_ns, size, delta)
+        if state is not None and state.delta_cube is not None:
+            # Com delta, as células das linhas novas (estado incremental) somam às do CSV
+            cells = sum_aggregates([cells, state.delta_cube], cube.CUBE_LEVELS)
+        return cells
+
+
+def load_cube(path=DATA_PATH):
+    """Cubo de vendas por (mês, marca, modelo, região), persistido ao lado dos dados.
+
+    Inclui as linhas do delta ``<csv>.delta.csv``, se houver, como load_summary.
+    """
+    return _cube_cached(*_signature(path), _backend_name(), _delta_signature(path))
+
+
+@instrument.counted("simulation")
+@st.cache_data(max_entries=32, show_spinner=False)
+def _simulation_cached(p_success, n_sim, replications, seed):
+    with instrument.cache_build("simulation"):
+        return simulate_bernoulli(p_success, n_sim=n_sim, replications=replications, seed=seed)
+
+
+def run_simulation(p_success, n_sim, replications=1000, seed=DEFAULT_SEED):
+    """Simulação de Bernoulli cacheada por (p, n_sim, réplicas, semente)."""
+    return _simulation_cached(p_success, n_sim, replications, seed)
+
+
+def invalidate():
+    """Descarta os dados em cache, forçando a releitura na próxima chamada."""
+    _load_cached.clear()
+    _derived_cached.clear()
+    _backend_cached.clear()
+    _slice_cached.clear()
+    _index_cached.clear()
+    _incremental_cached.clear()
+    _summary_cached.clear()
+    _section_cached.clear()
+    _sketches_cached.clear()
+    _heatmap_cached.clear()
+    _chart_cached.clear()
+    _params_cached.clear()
+    _cube_cached.clear()
@@ -0,0 +1,67 @@
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+from sneakers.params import GROUP_LEVELS, POISSON_WINDOW, ParamTable
+from sneakers.stats import SummaryStats, compute_summary
+
+
+@dataclass(frozen=True)
+class Report:
+    """Todas as métricas das duas páginas, calculadas sem Streamlit."""
+
+    summary: SummaryStats
+    params: ParamTable
+
+    @property
+    def p_success(self):
+        return float(self.params.lookup()["above_rate"])
+
+    @property
+    def brands(self):
+        """Participação, taxa acima do varejo e λ de cada marca."""
+        table = self.params.table
+        only_brand = table["Brand"].notna()
+        for level in GROUP_LEVELS[1:]:
+            only_brand &= table[level].isna()
+        return table.loc[only_brand, ["Brand", "count", "share", "above_rate", "lam"]].reset_index(drop=True)
+
+    def to_dict(self):
+        """Relatório serializável em JSON."""
+        return {
+            "n_rows": self.summary.n_rows,
+            "best_seller": self.summary.best_seller,
+            "p_success": self.p_success,
+            "poisson_window": self.params.window,
+            "columns": {
+                column: {**asdict(stats), "quantiles": {str(q): v for q, v in stats.quantiles.items()}}
+                for column, stats in self.summary.columns.items()
+            },
+            "corr": self.summary.corr.to_dict(),
+            "brands": self.brands.to_dict(orient="records"),
+        }
+
+    def to_frames(self):
+        """Relatório como tabelas (nome -> DataFrame), para gravar em Parquet."""
+        columns = pd.DataFrame([
+            {"column": column, "mean": stats.mean, "median": stats.median, "mode": stats.mode,
+             **{f"q{int(q * 100)}": v for q, v in stats.quantiles.items()}}
+            for column, stats in self.summary.columns.items()
+        ])
+        scalars = pd.DataFrame([{
+            "n_rows": self.summary.n_rows,
+            "best_seller": self.summary.best_seller,
+            "p_success": self.p_success,
+            "poisson_window": self.params.window,
+        }])
+        return {
+            "scalars": scalars,
+            "columns": columns,
+            "corr": self.summary.corr.rename_axis("column").reset_index(),
+            "groups": self.params.table,
+        }
+
+
+def compute_metrics(df, window=POISSON_WINDOW):
+    """Calcula o relatório completo a partir do frame limpo."""
+    return Report(summary=compute_summary(df), params=ParamTable(df, window))
@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from sneakers.data import profit_margin
+
+# Agrupamento padrão: modelo, tamanho e região do comprador
+GROUP_BY = ["Sneaker Name", "Shoe Size", "Buyer Region"]
+
+# Colunas resumidas por grupo (média, mediana e moda); a terceira linha da
+# matriz compartilhada é o indicador de venda acima do varejo
+STAT_COLUMNS = ["Profit Margin (%)", "Days to Sell"]
+
+# Abaixo disso o custo de criar processos supera o ganho
+MIN_PARALLEL_ROWS = 200_000
+
+
+def _mode(values):
+    # Menor valor entre os mais frequentes, como Series.mode().iloc[0]
+    uniques, counts = np.unique(values, return_counts=True)
+    return uniques[np.argmax(counts)]
+
+
+def _stats_for_groups(matrix, offsets):
+    """Estatísticas dos grupos delimitados por ``offsets`` numa matriz ordenada por grupo."""
+    n_groups = len(offsets) - 1
+    out = np.empty((n_groups, 3 * len(STAT_COLUMNS) + 2))
+    for g in range(n_groups):
+        lo, hi = offsets[g], offsets[g + 1]
+        row = []
+        for c in range(len(STAT_COLUMNS)):
+            values = matrix[c, lo:hi]
+            values = values[~np.isnan(values)]
+            if len(values):
+                row += [values.mean(), np.median(values), _mode(values)]
+            else:
+                row += [np.nan, np.nan, np.nan]
+        row += [hi - lo, matrix[len(STAT_COLUMNS), lo:hi].mean()]
+        out[g] = row
+    return out
+
+
+def _partition_stats(shm_name, shape, offsets):
+    # Executado no processo filho: lê as colunas direto da memória compartilhada,
+    # sem receber o DataFrame por pickle
+    shm = shared_memory.SharedMemory(name=shm_name)
+    matrix = None
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return _stats_for_groups(matrix, offsets)
+    finally:
+        # Solta a view antes de fechar o bloco (close falha com views vivas)
+        del matrix
+        shm.close()
+
+
+def _partitions(offsets, n_parts):
+    """Divide os grupos em faixas contíguas com número parecido de linhas."""
+    total = offsets[-1]
+    targets = np.linspace(0, total, n_parts + 1)[1:-1]
+    cuts = np.unique(np.concatenate([[0], np.searchsorted(offsets, targets), [len(offsets) - 1]]))
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def group_stats(df, by=GROUP_BY, max_workers=None, tasks_per_worker=4):
+    """Média, mediana e moda da margem e dos dias para venda, e a taxa acima do varejo, por grupo.
+
+    As linhas são ordenadas por grupo uma única vez e copiadas para um bloco de
+    memória compartilhada; cada processo recebe só o nome do bloco e uma faixa
+    contígua de grupos, e os resultados parciais são concatenados no final.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    grouped = df.groupby(by, observed=True, sort=True)
+    keys = grouped.size().index.to_frame(index=False)
+    # Com alguma chave nula o ngroup vem em float com NaN: vira o grupo -1
+    group_ids = grouped.ngroup().fillna(-1).astype(np.int64).to_numpy()
+    # Linhas com chave nula (grupo -1) ficam de fora, como no groupby
+    valid = np.flatnonzero(group_ids >= 0)
+    order = valid[np.argsort(group_ids[valid], kind="stable")]
+    offsets = np.concatenate([[0], np.bincount(group_ids[valid], minlength=len(keys)).cumsum()])
+
+    columns = {"Profit Margin (%)": profit_margin(df), "Days to Sell": df["Days to Sell"]}
+    shape = (len(STAT_COLUMNS) + 1, len(order))
+    parallel = max_workers > 1 and len(order) >= MIN_PARALLEL_ROWS
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8)) if parallel else None
+    matrix = None
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf) if parallel else np.empty(shape)
+        for c, column in enumerate(STAT_COLUMNS):
+            matrix[c] = columns[column].to_numpy(dtype=np.float64)[order]
+        matrix[-1] = (df["Sale Price"] > df["Retail Price"]).to_numpy()[order]
+
+        if not parallel:
+            results = _stats_for_groups(matrix, offsets)
+        else:
+            parts = _partitions(offsets, max_workers * tasks_per_worker)
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_partition_stats, shm.name, shape, offsets[start:stop + 1])
+                           for start, stop in parts]
+                results = np.vstack([future.result() for future in futures])
+    finally:
+        if shm is not None:
+            del matrix
+            shm.close()
+            shm.unlink()
+
+    names = [f"{column} {stat}" for column in STAT_COLUMNS for stat in ("mean", "median", "mode")]
+    stats = pd.DataFrame(results, columns=names + ["count", "above_rate"])
+    stats["count"] = stats["count"].astype(np.int64)
+    return pd.concat([keys, stats], axis=1)
@@ -0,0 +1,108 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from sneakers import snapshot
+from sneakers.data import above_retail
+
+# Níveis de agrupamento dos parâmetros, do mais geral ao mais específico
+GROUP_LEVELS = ["Brand", "Sneaker Name", "Shoe Size", "Buyer Region"]
+
+# Versão das contagens por grupo gravadas ao lado de cada partição (ver load_group_counts)
+COUNTS_VERSION = f"schema{snapshot.SCHEMA_VERSION}-counts1"
+
+# λ = POISSON_WINDOW * participação; a PMF/CDF cobre k = 0..POISSON_WINDOW
+POISSON_WINDOW = 20
+
+
+def group_counts(df):
+    """Vendas e vendas acima do varejo por (marca, modelo, tamanho, região)."""
+    return (
+        df[GROUP_LEVELS]
+        .assign(above=above_retail(df).to_numpy())
+        .groupby(GROUP_LEVELS, observed=True)
+        .agg(count=("above", "size"), above=("above", "sum"))
+        .reset_index()
+    )
+
+
+def load_group_counts(directory):
+    """group_counts de um diretório particionado, somando as contagens guardadas por partição."""
+    from sneakers.partitions import aggregate_partitions
+
+    return aggregate_partitions(directory, "counts", group_counts, GROUP_LEVELS, COUNTS_VERSION)
+
+
+class ParamTable:
+    """Parâmetros de Bernoulli e Poisson para todas as combinações de grupos.
+
+    Um único group-by por (marca, modelo, tamanho, região) gera as contagens
+    base; os demais níveis são somas dessas contagens. Cada linha traz a
+    participação nas vendas, a taxa acima do varejo e o λ, e as matrizes
+    ``pmf``/``cdf`` têm uma linha por grupo. ``lookup`` é um acesso a dicionário.
+    """
+
+    def __init__(self, df, window=POISSON_WINDOW):
+        self._build(group_counts(df), window)
+
+    @classmethod
+    def from_counts(cls, base, window=POISSON_WINDOW):
+        """Tabela a partir das contagens de group_counts, já agregadas em outro lugar (ex.: SQL)."""
+        params = cls.__new__(cls)
+        params._build(base, window)
+        return params
+
+    def _build(self, base, window):
+        self.window = window
+        total = int(base["count"].sum())
+
+        rollups = []
+        for size in range(len(GROUP_LEVELS) + 1):
+            for levels in combinations(GROUP_LEVELS, size):
+                if levels:
+                    part = base.groupby(list(levels), observed=True)[["count", "above"]].sum().reset_index()
+                else:
+                    part = base[["count", "above"]].sum().to_frame().T
+                rollups.append(part)
+        table = pd.concat(rollups, ignore_index=True)
+        for level in GROUP_LEVELS:
+            # None marca "todos" nesse nível
+            table[level] = table[level].astype(object).where(table[level].notna(), None)
+
+        table["share"] = table["count"] / total if total else np.nan
+        table["above_rate"] = table["above"] / table["count"]
+        table["lam"] = window * table["share"]
+        self.table = table[GROUP_LEVELS + ["count", "above", "share", "above_rate", "lam"]]
+
+        # Importado aqui para que carregar o pacote não traga o scipy junto
+        from scipy.stats import poisson
+
+        k = np.arange(window + 1)
+        lam = self.table["lam"].to_numpy()[:, None]
+        self.k = k
+        self.pmf = poisson.pmf(k[None, :], lam)
+        self.cdf = poisson.cdf(k[None, :], lam)
+        self._index = {key: row for row, key in enumerate(self.table[GROUP_LEVELS].itertuples(index=False, name=None))}
+
+        # Opções de cada nível por (nível, filtros dos outros níveis com o próprio nível em None),
+        # na ordem da tabela: cada grupo é uma opção do seu nível para os mesmos filtros
+        self._options = {}
+        for key in self._index:
+            for i, level in enumerate(GROUP_LEVELS):
+                if key[i] is not None:
+                    fixed = key[:i] + (None,) + key[i + 1:]
+                    self._options.setdefault((level, fixed), []).append(key[i])
+
+    def values(self, level, **filters):
+        """Valores disponíveis de um nível, dado os filtros dos outros níveis."""
+        fixed = tuple(None if name == level else filters.get(name) for name in GROUP_LEVELS)
+        return list(self._options.get((level, fixed), ()))
+
+    def lookup(self, brand=None, sneaker=None, size=None, region=None):
+        """Linha de parâmetros do grupo (None = todos), com PMF e CDF de Poisson."""
+        row = self._index[(brand, sneaker, size, region)]
+        params = self.table.iloc[row].to_dict()
+        params["pmf"] = self.pmf[row]
+        params["cdf"] = self.cdf[row]
+        return params
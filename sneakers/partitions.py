@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+from sneakers import snapshot
+from sneakers.data import CATEGORY_COLUMNS, read_data
+from sneakers.files import atomic_write
+from sneakers.index import SalesIndex, year_slice
+
+# Diretório particionado: um arquivo por mês, ano ou marca (CSV bruto ou
+# Parquet já limpo), descritos por um manifesto com datas e marcas de cada um.
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Agregados gravados ao lado de cada partição (ver aggregate_partitions)
+AGGREGATE_SUFFIXES = (".cube.parquet", ".counts.parquet")
+
+PARTITION_BY = {
+    "month": lambda df: df["Order Date"].dt.strftime("%Y-%m"),
+    "year": lambda df: df["Order Date"].dt.strftime("%Y"),
+    "brand": lambda df: df["Brand"].astype(str).str.strip().str.replace(r"\W+", "-", regex=True),
+}
+
+
+def list_partitions(directory):
+    """Arquivos de partição do diretório, em ordem de nome.
+
+    Um .parquet com o mesmo nome de um .csv é o snapshot desse CSV (ver
+    sneakers.snapshot), e os agregados por partição (AGGREGATE_SUFFIXES) também
+    não são partições.
+    """
+    names = sorted(os.listdir(directory))
+    csv_stems = {os.path.splitext(name)[0] for name in names if name.endswith(".csv")}
+    return [
+        name for name in names
+        if name.endswith(".csv")
+        or (name.endswith(".parquet") and not name.endswith(AGGREGATE_SUFFIXES)
+            and os.path.splitext(name)[0] not in csv_stems)
+    ]
+
+
+def signature(directory):
+    """(caminho absoluto, maior mtime em ns, tamanho total) das partições."""
+    mtime_ns, size = 0, 0
+    for name in list_partitions(directory):
+        stat = os.stat(os.path.join(directory, name))
+        mtime_ns, size = max(mtime_ns, stat.st_mtime_ns), size + stat.st_size
+    return os.path.abspath(directory), mtime_ns, size
+
+
+def read_partition(path, columns=None):
+    """Lê uma partição já limpa: Parquet diretamente, CSV pelo snapshot.
+
+    O resultado vem ordenado por "Order Date" (quando a coluna é lida), como
+    select_rows e o SalesIndex esperam: o CSV já sai ordenado de read_data, e
+    um Parquet gravado fora de write_partitions é ordenado na leitura.
+    """
+    if path.endswith(".parquet"):
+        df = pq.read_table(path, columns=columns, memory_map=True).to_pandas(split_blocks=True, self_destruct=True)
+        if "Order Date" in df and not df["Order Date"].is_monotonic_increasing:
+            df = df.sort_values("Order Date", kind="stable", ignore_index=True)
+        return df
+    df = snapshot.load(path)
+    return df if columns is None else df[columns]
+
+
+def describe(directory, name):
+    """Entrada do manifesto de uma partição: linhas, intervalo de datas e marcas."""
+    path = os.path.join(directory, name)
+    stat = os.stat(path)
+    df = read_partition(path, columns=["Order Date", "Brand"])
+    dates = df["Order Date"].dropna()
+    return {
+        "file": name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "rows": len(df),
+        "first_date": dates.min().isoformat() if len(dates) else None,
+        "last_date": dates.max().isoformat() if len(dates) else None,
+        "brands": sorted(str(brand) for brand in df["Brand"].dropna().unique()),
+    }
+
+
+def load_manifest(directory, max_workers=None):
+    """Manifesto do diretório, atualizando só as partições novas ou alteradas."""
+    path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if manifest is None or manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "partitions": []}
+
+    known = {entry["file"]: entry for entry in manifest["partitions"]}
+    entries, stale = {}, []
+    for name in list_partitions(directory):
+        stat = os.stat(os.path.join(directory, name))
+        entry = known.get(name)
+        if entry is not None and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            entries[name] = entry
+        else:
+            stale.append(name)
+    if not stale and len(entries) == len(known):
+        return manifest
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        for entry in pool.map(lambda name: describe(directory, name), stale):
+            entries[entry["file"]] = entry
+    manifest = {"version": MANIFEST_VERSION, "partitions": [entries[name] for name in sorted(entries)]}
+    # Diretório somente leitura: o manifesto é recalculado a cada carga
+    atomic_write(path, lambda tmp_path: _dump_json(manifest, tmp_path), required=False)
+    return manifest
+
+
+def _dump_json(value, path):
+    with open(path, "w") as f:
+        json.dump(value, f, indent=1)
+
+
+def prune(manifest, years=None, brands=None):
+    """Entradas do manifesto que podem ter linhas dos anos e marcas pedidos."""
+    selected = []
+    for entry in manifest["partitions"]:
+        if not entry["rows"]:
+            continue
+        if years is not None:
+            first, last = years
+            if int(entry["last_date"][:4]) < first or int(entry["first_date"][:4]) > last:
+                continue
+        if brands is not None and not set(brands) & set(entry["brands"]):
+            continue
+        selected.append(entry)
+    return selected
+
+
+def covers(entry, years=None, brands=None):
+    """(anos, marcas) da consulta que ainda precisam ser filtrados nas linhas da partição.
+
+    Um filtro que a partição inteira já satisfaz, segundo o manifesto, volta
+    como None: uma partição mensal dentro do período ou uma partição de marca
+    pedida é usada sem olhar as linhas.
+    """
+    if years is not None and years[0] <= int(entry["first_date"][:4]) and int(entry["last_date"][:4]) <= years[1]:
+        years = None
+    if brands is not None and set(entry["brands"]) <= set(brands):
+        brands = None
+    return years, brands
+
+
+def select_rows(df, years=None, brands=None):
+    """Filtro exato de anos (inclusivo) e marcas sobre um frame ordenado por data.
+
+    Os anos são busca binária; as marcas passam pelo SalesIndex da coluna
+    "Brand", que parte das posições de cada marca em vez de uma máscara.
+    """
+    if brands is not None:
+        return SalesIndex(df, levels=("Brand",), assume_sorted=True).select(years, brands)
+    if years is not None:
+        return year_slice(df, *years, assume_sorted=True)
+    return df
+
+
+def empty_partition(path):
+    """Frame vazio com o schema de uma partição (colunas e tipos, sem linhas)."""
+    if path.endswith(".parquet"):
+        return pq.read_schema(path).empty_table().to_pandas()
+    return read_partition(path).iloc[:0]
+
+
+def concat_partitions(frames):
+    """Concatena partições mantendo as colunas categóricas e a ordem por data.
+
+    Se todas estiverem vazias, devolve a primeira (o schema sem linhas).
+    """
+    if not frames:
+        return pd.DataFrame()
+    nonempty = [frame for frame in frames if len(frame)]
+    if not nonempty:
+        return frames[0].iloc[:0]
+    frames = _union_categories(nonempty)
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values("Order Date", kind="stable", ignore_index=True)
+
+
+def _union_categories(frames):
+    # Mesmas categorias em todos os frames, para que concat mantenha o tipo category
+    if len(frames) > 1:
+        for column in CATEGORY_COLUMNS:
+            categories = union_categoricals([frame[column] for frame in frames], ignore_order=True).categories
+            frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return frames
+
+
+def _read_selected(directory, entry, years, brands):
+    # Lê a partição e aplica só os filtros que o manifesto não garante
+    return select_rows(read_partition(os.path.join(directory, entry["file"])), *covers(entry, years, brands))
+
+
+def read_partitions(directory, years=None, brands=None, max_workers=None):
+    """Lê apenas as partições que podem responder à consulta, em paralelo.
+
+    As partições são lidas e filtradas por um pool de threads (a leitura do
+    Parquet libera o GIL); ``attrs["partitions"]`` traz quantas partições
+    foram lidas de quantas existem. Sem partições selecionadas, o resultado
+    é um frame vazio com o schema dos dados.
+    """
+    manifest = load_manifest(directory, max_workers)
+    selected = prune(manifest, years, brands)
+    with ThreadPoolExecutor(max_workers) as pool:
+        frames = list(pool.map(lambda entry: _read_selected(directory, entry, years, brands), selected))
+    if not frames and manifest["partitions"]:
+        frames = [empty_partition(os.path.join(directory, manifest["partitions"][0]["file"]))]
+    df = concat_partitions(frames)
+    df.attrs["partitions"] = (len(selected), len(manifest["partitions"]))
+    return df
+
+
+def aggregate_path(path, name):
+    """Agregado ``name`` de uma partição, gravado ao lado dela ("2019-01.cube.parquet")."""
+    return os.path.splitext(path)[0] + f".{name}.parquet"
+
+
+def _partition_aggregate(path, name, build, version):
+    out_path = aggregate_path(path, name)
+    if snapshot.is_fresh(path, out_path, version=version):
+        return pq.read_table(out_path).to_pandas()
+    aggregate = build(read_partition(path))
+    snapshot.write_frame(aggregate, path, out_path, version=version, required=False)
+    return aggregate
+
+
+def aggregate_partitions(directory, name, build, levels, version, max_workers=None):
+    """Agregado aditivo do diretório inteiro (ex.: cubo, contagens por grupo).
+
+    Cada partição guarda o seu resultado de ``build`` em um Parquet ao lado,
+    refeito só quando ela muda; o diretório é a soma desses agregados por
+    ``levels``. A carga lê os agregados, que são pequenos, e não as vendas.
+    """
+    manifest = load_manifest(directory, max_workers)
+    paths = [os.path.join(directory, entry["file"]) for entry in manifest["partitions"] if entry["rows"]]
+    with ThreadPoolExecutor(max_workers) as pool:
+        parts = list(pool.map(lambda path: _partition_aggregate(path, name, build, version), paths))
+    if not parts:
+        raise ValueError(f"Diretório sem partições: {directory}")
+    return sum_aggregates(parts, levels)
+
+
+def sum_aggregates(parts, levels):
+    """Soma agregados aditivos (cubos, contagens por grupo) célula a célula por ``levels``.
+
+    As colunas categóricas de todas as partes passam a ter as mesmas categorias.
+    """
+    parts = _union_categories([part for part in parts if len(part)] or parts[:1])
+    if len(parts) == 1:
+        return parts[0]
+    return (pd.concat(parts, ignore_index=True)
+            .groupby(list(levels), observed=True, sort=True).sum()
+            .reset_index())
+
+
+def write_partitions(df, directory, by="month"):
+    """Grava ``df`` (já limpo) como um Parquet por partição e monta o manifesto."""
+    os.makedirs(directory, exist_ok=True)
+    for key, part in df.groupby(PARTITION_BY[by](df), sort=True):
+        table = pa.Table.from_pandas(part.reset_index(drop=True), preserve_index=False)
+        atomic_write(os.path.join(directory, f"{key}.parquet"), lambda tmp_path: pq.write_table(table, tmp_path))
+    return load_manifest(directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Divide as vendas em um diretório particionado com manifesto")
+    parser.add_argument("source", help="CSV de vendas da StockX")
+    parser.add_argument("directory", help="diretório de saída (um Parquet por partição + manifest.json)")
+    parser.add_argument("--by", choices=sorted(PARTITION_BY), default="month")
+    args = parser.parse_args(argv)
+
+    manifest = write_partitions(read_data(args.source), args.directory, by=args.by)
+    rows = sum(entry["rows"] for entry in manifest["partitions"])
+    print(f"{len(manifest['partitions'])} partições ({rows:,} vendas) em {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+# Remove "$" e "," de valores no formato "$1,097"
+_CURRENCY_TABLE = str.maketrans("", "", "$,")
+
+
+def parse_prices(values, dtype=np.float64):
+    """Converte strings de moeda ("$1,097") para números.
+
+    Os preços da StockX se repetem muito, então apenas os valores distintos são
+    convertidos e o resultado é espalhado de volta pelos códigos do factorize.
+    Valores malformados viram NaN em vez de gerar exceção.
+
+    Retorna (array de ``dtype``, quantidade de valores malformados).
+    """
+    series = pd.Series(values, copy=False)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=dtype), 0
+
+    codes, uniques = pd.factorize(series)
+    cleaned = [str(value).translate(_CURRENCY_TABLE).strip() for value in uniques]
+    parsed = pd.to_numeric(pd.Series(cleaned, dtype=object), errors="coerce").to_numpy(dtype=dtype)
+
+    present = codes >= 0
+    result = np.full(len(codes), np.nan, dtype=dtype)
+    result[present] = parsed[codes[present]]
+
+    # Ocorrências (não nulas) cujo valor distinto não pôde ser convertido
+    counts = np.bincount(codes[present], minlength=len(uniques))
+    invalid = int(counts[np.isnan(parsed)].sum())
+    return result, invalid
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Semente fixa: o mesmo p gera sempre a mesma simulação entre reruns
+DEFAULT_SEED = 42
+
+# Limite de sorteios por bloco no modo "draws" (e de réplicas por bloco)
+DEFAULT_CHUNK = 1_000_000
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Resumo de ``replications`` simulações de ``n_sim`` vendas de Bernoulli(p)."""
+
+    p: float
+    n_sim: int
+    replications: int
+    seed: int
+    confidence: float
+    first: np.ndarray
+    mean_above: float
+    ci_above: tuple
+
+    @property
+    def mean_below(self):
+        return self.n_sim - self.mean_above
+
+    @property
+    def ci_below(self):
+        low, high = self.ci_above
+        return self.n_sim - high, self.n_sim - low
+
+
+def _count_draws(rng, p, n_sim, chunk):
+    # Sorteio venda a venda, em blocos, para memória limitada a ``chunk``
+    successes = 0
+    for start in range(0, n_sim, chunk):
+        size = min(chunk, n_sim - start)
+        successes += int(np.count_nonzero(rng.random(size) < p))
+    return successes
+
+
+def simulate_bernoulli(p, n_sim=1000, replications=1000, seed=DEFAULT_SEED,
+                       confidence=0.95, method="binomial", chunk=DEFAULT_CHUNK):
+    """Simula vendas acima do varejo com um ``numpy.random.Generator`` semeado.
+
+    No método padrão ("binomial") cada réplica é um único sorteio Binomial(n_sim, p),
+    que tem a mesma distribuição da soma de n_sim Bernoulli(p): o custo não depende
+    de n_sim, então 10^7-10^8 vendas por réplica saem em tempo constante. O método
+    "draws" sorteia venda a venda em blocos de ``chunk``.
+    """
+    rng = np.random.default_rng(seed)
+    successes = np.empty(replications, dtype=np.int64)
+    if method == "binomial":
+        for start in range(0, replications, chunk):
+            size = min(chunk, replications - start)
+            successes[start:start + size] = rng.binomial(n_sim, p, size=size)
+    elif method == "draws":
+        for i in range(replications):
+            successes[i] = _count_draws(rng, p, n_sim, chunk)
+    else:
+        raise ValueError(f"Método de simulação desconhecido: {method!r}")
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(successes, [alpha, 1 - alpha])
+    return SimulationResult(
+        p=float(p),
+        n_sim=n_sim,
+        replications=replications,
+        seed=seed,
+        confidence=confidence,
+        first=np.array([n_sim - successes[0], successes[0]]),
+        mean_above=float(successes.mean()),
+        ci_above=(float(low), float(high)),
+    )
@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Erro de posição padrão: ±1% do número de linhas, excedido com probabilidade
+# de no máximo DEFAULT_DELTA (1%) para cada quantil consultado
+DEFAULT_EPS = 0.01
+DEFAULT_DELTA = 0.01
+
+_DECAY = 2 / 3
+
+# Com capacidades decaindo em 2/3, a soma dos quadrados dos pesos de todas as
+# compactações fica abaixo de _VARIANCE_FACTOR * n**2 / k**2, e o peso de um
+# item do nível mais alto abaixo de _TOP_WEIGHT_FACTOR * n / k (ver QuantileSketch)
+_VARIANCE_FACTOR = 12
+_TOP_WEIGHT_FACTOR = 3
+
+# update entrega os valores ao nível 0 em pedaços de até _BATCH_FACTOR * k:
+# cada ordenação fica O(k log k), e não O(n log n) sobre o bloco inteiro
+_BATCH_FACTOR = 8
+
+
+def sketch_size(eps=DEFAULT_EPS, delta=DEFAULT_DELTA):
+    """Capacidade k do nível mais alto para erro ``eps * n`` com probabilidade ``1 - delta``."""
+    spread = math.sqrt(2 * _VARIANCE_FACTOR * math.log(2 / delta)) + _TOP_WEIGHT_FACTOR
+    return max(8, math.ceil(spread / eps))
+
+
+class QuantileSketch:
+    """Sketch KLL de quantis, combinável entre partições.
+
+    Guarda O((1/eps)·sqrt(log(1/delta))·log(n)) valores: cada nível h
+    representa 2**h linhas e, quando enche, é ordenado e metade dos itens
+    (alternados, a partir de um deslocamento aleatório) sobe para o nível
+    seguinte. Cada compactação no nível h desloca a posição de um quantil em
+    0 ou ±2**h com sinal aleatório, então o erro total é limitado pela
+    desigualdade de Hoeffding; escolher o item devolvido soma no máximo o peso
+    de um item do topo. Nível h compacta no máximo n / (2**h * capacidade)
+    vezes e o topo tem 2**H <= 3n/k, logo a soma dos quadrados dos pesos fica
+    abaixo de 12·n²/k²; ``k = sketch_size(eps, delta)`` garante posição a no
+    máximo ``eps * n`` da exata com probabilidade de pelo menos ``1 - delta``
+    para cada quantil consultado. O erro não é determinístico.
+    """
+
+    def __init__(self, eps=DEFAULT_EPS, seed=0, delta=DEFAULT_DELTA):
+        self.eps = eps
+        self.delta = delta
+        self.k = sketch_size(eps, delta)
+        self.n = 0
+        self.levels = [np.empty(0)]
+        # Soma dos quadrados dos pesos das compactações já feitas (variância do erro)
+        self.variance = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * _DECAY ** depth))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # Número par de itens promovidos; um eventual ímpar fica no nível
+                keep = items[:1] if len(items) % 2 else items[:0]
+                pairs = items[len(keep):]
+                promoted = pairs[self._rng.integers(2)::2]
+                if len(pairs):
+                    self.variance += 4.0 ** level
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """Acrescenta um array de valores (NaN são ignorados)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        batch = _BATCH_FACTOR * self.k
+        for start in range(0, len(values), batch):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + batch]])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Incorpora outro sketch (de outra partição) a este."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.variance += other.variance
+        self.eps = max(self.eps, other.eps)
+        self.delta = max(self.delta, other.delta)
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = weights[order].cumsum()
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[order][min(position, len(values) - 1)])
+
+    @property
+    def rank_error(self):
+        """Erro de posição, em linhas, excedido com probabilidade de no máximo ``delta``.
+
+        Vem das compactações de fato realizadas (Hoeffding) mais o peso de um
+        item do nível mais alto, e nunca passa de ``eps * n``.
+        """
+        bound = math.sqrt(2 * self.variance * math.log(2 / self.delta)) + 2 ** (len(self.levels) - 1)
+        return min(bound, self.eps * self.n)
+
+
+def sketch_column(values, eps=DEFAULT_EPS, chunksize=1_000_000):
+    """Sketch de uma coluna, construído por blocos e combinado no final."""
+    values = np.asarray(values, dtype=np.float64)
+    partials = [QuantileSketch(eps, seed=i).update(values[start:start + chunksize])
+                for i, start in enumerate(range(0, len(values), chunksize))]
+    return merge_sketches(partials, eps)
+
+
+def sketch_by_group(values, groups, eps=DEFAULT_EPS):
+    """Um sketch por grupo (ex.: por marca), que podem ser combinados depois."""
+    series = pd.Series(np.asarray(values, dtype=np.float64))
+    codes, uniques = pd.factorize(pd.Series(groups))
+    return {
+        uniques[code]: QuantileSketch(eps, seed=int(code)).update(part.to_numpy())
+        for code, part in series.groupby(codes) if code >= 0
+    }
+
+
+def merge_sketches(sketches, eps=DEFAULT_EPS, delta=DEFAULT_DELTA):
+    merged = QuantileSketch(eps, delta=delta)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
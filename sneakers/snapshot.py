@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import sys
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sneakers.data import DATA_PATH, file_signature, read_data
+from sneakers.files import atomic_write
+
+# Incrementar sempre que clean_data mudar as colunas ou os tipos gerados
+SCHEMA_VERSION = 5
+
+_META_KEY = b"sneakers"
+
+
+def snapshot_path(csv_path=DATA_PATH):
+    """Caminho do snapshot Parquet ao lado do CSV de origem."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def source_hash(path, block_size=1 << 20):
+    """SHA-256 do arquivo de origem, lido em blocos.
+
+    Para um diretório particionado, o hash do manifesto (arquivos, tamanhos e datas).
+    """
+    if os.path.isdir(path):
+        from sneakers.partitions import load_manifest
+
+        return hashlib.sha256(json.dumps(load_manifest(path), sort_keys=True).encode()).hexdigest()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_metadata(path):
+    """Metadados gravados pelo build_snapshot, ou None se ausentes/ilegíveis."""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if _META_KEY not in metadata:
+        return None
+    return json.loads(metadata[_META_KEY])
+
+
+def source_metadata(csv_path, version=SCHEMA_VERSION):
+    """Versão e identificação da origem gravadas junto de cada arquivo derivado."""
+    _, mtime_ns, size = file_signature(csv_path)
+    return {
+        "schema_version": version,
+        "source_hash": source_hash(csv_path),
+        "source_size": size,
+        "source_mtime_ns": mtime_ns,
+    }
+
+
+def check_source(meta, csv_path, version=SCHEMA_VERSION):
+    """Confere ``meta`` com a origem: None se estiver velho, senão os metadados válidos.
+
+    Se só o tamanho/mtime mudaram e o hash confere (arquivo apenas tocado),
+    devolve uma cópia com os novos valores; o chamador deve regravá-la para
+    que as próximas partidas não calculem o hash de novo.
+    """
+    if meta is None or meta.get("schema_version") != version:
+        return None
+    _, mtime_ns, size = file_signature(csv_path)
+    # Mesmo tamanho e mtime: evita reler o CSV inteiro só para calcular o hash
+    if (meta.get("source_size"), meta.get("source_mtime_ns")) == (size, mtime_ns):
+        return meta
+    if meta.get("source_hash") != source_hash(csv_path):
+        return None
+    return {**meta, "source_size": size, "source_mtime_ns": mtime_ns}
+
+
+def _write_table(table, meta, out_path, required=True):
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()}
+    )
+    return atomic_write(out_path, lambda tmp_path: pq.write_table(table, tmp_path), required=required)
+
+
+def write_frame(df, csv_path, out_path, version=SCHEMA_VERSION, required=True):
+    """Grava ``df`` em Parquet com os metadados de versão e do CSV de origem.
+
+    Com ``required=False``, uma falha de gravação só faz retornar False (ver files.atomic_write).
+    """
+    return _write_table(pa.Table.from_pandas(df, preserve_index=False), source_metadata(csv_path, version),
+                        out_path, required=required)
+
+
+def build_snapshot(csv_path=DATA_PATH, out_path=None, df=None, required=True):
+    """Limpa o CSV e grava o resultado tipado em Parquet; retorna o DataFrame."""
+    if df is None:
+        df = read_data(csv_path)
+    write_frame(df, csv_path, out_path or snapshot_path(csv_path), required=required)
+    return df
+
+
+def is_fresh(csv_path=DATA_PATH, out_path=None, version=SCHEMA_VERSION):
+    """True se o arquivo derivado existe, tem a versão atual e corresponde ao CSV."""
+    out_path = out_path or snapshot_path(csv_path)
+    meta = read_metadata(out_path)
+    current = check_source(meta, csv_path, version)
+    if current is None:
+        return False
+    if current is not meta:
+        # Conteúdo igual, mtime/tamanho novos: atualiza só os metadados
+        _write_table(pq.read_table(out_path), current, out_path, required=False)
+    return True
+
+
+def read_snapshot(path):
+    """Lê o snapshot com memory map, sem cópia intermediária do buffer."""
+    table = pq.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def load(csv_path=DATA_PATH):
+    """Caminho rápido do loader: lê o snapshot e o reconstrói se estiver velho.
+
+    Um diretório particionado é lido partição a partição (cada CSV com seu
+    próprio snapshot), sem snapshot do conjunto inteiro.
+    """
+    if os.path.isdir(csv_path):
+        from sneakers.partitions import read_partitions
+
+        return read_partitions(csv_path)
+    out_path = snapshot_path(csv_path)
+    if is_fresh(csv_path, out_path):
+        return read_snapshot(out_path)
+    # Diretório somente leitura: segue com o CSV já limpo
+    return build_snapshot(csv_path, out_path, df=read_data(csv_path), required=False)
+
+
+if __name__ == "__main__":
+    # Etapa de build: python -m sneakers.snapshot [arquivo.csv]
+    csv = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    build_snapshot(csv)
+    print(f"Snapshot gravado em {snapshot_path(csv)}")
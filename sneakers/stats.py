@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from sneakers.aggregates import BEST_SELLER_YEARS, SUMMARY_COLUMNS, mode_from_counts, quantile_from_counts
+from sneakers.data import numeric_frame
+from sneakers.index import year_slice
+from sneakers.sketch import DEFAULT_EPS, sketch_column
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+@dataclass(frozen=True)
+class ColumnSummary:
+    mean: float
+    median: float
+    mode: float
+    quantiles: dict
+
+
+@dataclass(frozen=True)
+class SummaryStats:
+    """Resultado imutável das estatísticas da página de exploração."""
+
+    n_rows: int
+    best_seller: str
+    columns: dict
+    corr: pd.DataFrame
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+
+def best_seller(df, years=BEST_SELLER_YEARS, index=None):
+    """Tênis mais vendido dentro do intervalo de anos.
+
+    Com ``index`` (SalesIndex de ``df``) o recorte por ano é busca binária.
+    """
+    rows = index.select(years=years) if index is not None else year_slice(df, *years)
+    counts = rows["Sneaker Name"].value_counts()
+    return counts.idxmax() if not counts.empty else None
+
+
+def column_summaries(df, quantiles=QUANTILES):
+    """Média, mediana, moda e quantis das colunas resumidas, em uma passada por operação.
+
+    Com ``quantiles=()`` a ordenação dos quantis exatos é pulada e a mediana
+    fica NaN (modo aproximado, em que ela vem dos sketches).
+    """
+    # Acumula em float64 mesmo com as colunas guardadas em float32
+    summary = numeric_frame(df)[SUMMARY_COLUMNS].astype(np.float64)
+    means = summary.mean()
+    table = summary.quantile(list(quantiles)) if quantiles else None
+    modes = summary.mode()
+
+    columns = {}
+    for column in SUMMARY_COLUMNS:
+        mode = modes[column].dropna()
+        values = {q: float(table.at[q, column]) for q in quantiles}
+        columns[column] = ColumnSummary(
+            mean=float(means[column]),
+            median=values.get(0.5, np.nan),
+            mode=float(mode.iloc[0]) if not mode.empty else np.nan,
+            quantiles=values,
+        )
+    return columns
+
+
+def column_moments(df):
+    """Média e moda das colunas resumidas, sem mediana nem quantis exatos."""
+    return column_summaries(df, quantiles=())
+
+
+def correlation(df):
+    """Matriz de correlação do heatmap (sem "id")."""
+    return numeric_frame(df).corr()
+
+
+# Seções da página de exploração que podem ser calculadas (e cacheadas) separadamente
+SECTIONS = {
+    "best_seller": best_seller,
+    "columns": column_summaries,
+    "moments": column_moments,
+    "corr": correlation,
+}
+
+
+def compute_summary(df):
+    """Todas as estatísticas da página de exploração em um único objeto."""
+    return SummaryStats(
+        n_rows=len(df),
+        best_seller=best_seller(df),
+        columns=column_summaries(df),
+        corr=correlation(df),
+    )
+
+
+def summary_from_aggregates(aggregates):
+    """SummaryStats equivalente a partir de um estado ``Aggregates`` (streaming ou incremental)."""
+    columns = {}
+    for column in SUMMARY_COLUMNS:
+        counts = aggregates.value_counts[column]
+        quantiles = {q: quantile_from_counts(counts, q) for q in QUANTILES}
+        columns[column] = ColumnSummary(
+            mean=aggregates.column_stats(column)["mean"],
+            median=quantiles[0.5],
+            mode=mode_from_counts(counts),
+            quantiles=quantiles,
+        )
+    return SummaryStats(
+        n_rows=aggregates.n_rows,
+        best_seller=aggregates.best_seller,
+        columns=columns,
+        corr=aggregates.corr,
+    )
+
+
+def approx_sketches(df, eps=DEFAULT_EPS):
+    """Sketches de quantis das colunas resumidas (modo aproximado, opcional)."""
+    numeric = numeric_frame(df)
+    return {column: sketch_column(numeric[column].to_numpy(), eps) for column in SUMMARY_COLUMNS}
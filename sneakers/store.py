@@ -0,0 +1,162 @@
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Orçamento de memória dos resultados compartilhados (MB), ajustável por variável de ambiente
+STORE_MB_ENV = "SNEAKERS_STORE_MB"
+DEFAULT_STORE_MB = 512
+
+
+def estimate_size(value, _depth=0):
+    """Tamanho aproximado, em bytes, de um resultado guardado no store.
+
+    Objetos com ``owned_nbytes()`` informam só os dados que são deles: o frame
+    compartilhado que referenciam já é contado (ou não) pelo cache que o guarda.
+    """
+    if hasattr(value, "owned_nbytes"):
+        return int(value.owned_nbytes())
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if hasattr(value, "to_plotly_json"):
+        # Figura Plotly: os dados ficam em dicts aninhados, medidos pelo JSON
+        return len(value.to_json())
+    if _depth < 3:
+        if isinstance(value, dict):
+            return sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return sum(estimate_size(v, _depth + 1) for v in value)
+        if hasattr(value, "__dict__"):
+            return sys.getsizeof(value) + estimate_size(vars(value), _depth + 1)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """Cálculo em andamento de uma chave; as threads que chegam depois esperam por ele."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+        self.value = None
+
+
+class ResultStore:
+    """Resultados derivados compartilhados por todas as sessões do processo.
+
+    LRU limitado por tamanho (``max_bytes``): ao passar do orçamento, os
+    resultados usados há mais tempo saem primeiro, o que também descarta as
+    versões antigas do arquivo. Cada chave é calculada por uma única thread;
+    as demais sessões que pedem a mesma chave fria esperam e recebem o mesmo
+    objeto, mesmo quando ele é grande demais para ficar guardado. Os
+    resultados são compartilhados: trate-os como somente leitura.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _lookup(self, key):
+        # Chamado com self._lock adquirido
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def get(self, key, compute):
+        """Valor de ``key``, calculado com ``compute()`` apenas se ainda não estiver no store."""
+        while True:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    return entry[0]
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    break
+            flight.done.wait()
+            if flight.ok:
+                with self._lock:
+                    self.hits += 1
+                return flight.value
+            # O cálculo falhou na outra thread: esta tenta de novo
+
+        try:
+            value = compute()
+            size = estimate_size(value)
+        except BaseException:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+            raise
+        with self._lock:
+            self._put(key, value, size)
+            flight.value, flight.ok = value, True
+            del self._flights[key]
+        flight.done.set()
+        return value
+
+    def _put(self, key, value, size):
+        # Chamado com self._lock adquirido
+        self.misses += 1
+        if size > self.max_bytes:
+            # Maior que o orçamento inteiro: devolvido, mas não guardado
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def discard(self, match):
+        """Descarta os resultados cujas chaves satisfazem ``match(key)``."""
+        with self._lock:
+            for key in [k for k in self._entries if match(k)]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def clear(self, name=None):
+        """Descarta todos os resultados, ou só os da função ``name``."""
+        self.discard(lambda key: name is None or key[0] == name)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            }
+
+    def cached(self, name):
+        """Decorador: guarda o resultado da função no store, com chave (name, *args).
+
+        Os argumentos devem ser hasheáveis; a função decorada ganha ``clear()``.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                return self.get((name, *args), lambda: func(*args))
+
+            wrapper.clear = lambda: self.clear(name)
+            return wrapper
+
+        return decorator
+
+
+# Store único do processo, compartilhado por todas as sessões do Streamlit
+STORE = ResultStore(int(float(os.environ.get(STORE_MB_ENV, DEFAULT_STORE_MB)) * 1024 * 1024))
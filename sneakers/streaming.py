@@ -0,0 +1,56 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from sneakers.aggregates import SUMMARY_COLUMNS, Aggregates
+from sneakers.data import DATA_PATH, clean_data
+
+# Tipos explícitos na leitura: strings repetidas como category e números em
+# float32. Os preços chegam como "$1,097" e são convertidos por clean_data.
+CSV_DTYPES = {
+    "Brand": "category",
+    "Sneaker Name": "category",
+    "Buyer Region": "category",
+    "Shoe Size": np.float32,
+    "Sale Price": object,
+    "Retail Price": object,
+    "Order Date": object,
+    "Release Date": object,
+}
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def iter_clean_chunks(path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Lê o CSV em blocos e aplica a mesma limpeza do load_data() em cada um."""
+    with pd.read_csv(path, dtype=CSV_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield clean_data(chunk)
+
+
+def stream_aggregates(path=DATA_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Agregados do arquivo inteiro sem materializar o DataFrame completo.
+
+    O pico de memória fica limitado ao tamanho do bloco mais o estado de
+    ``Aggregates``, que cresce com a cardinalidade e não com as linhas.
+    """
+    aggregates = Aggregates()
+    for chunk in iter_clean_chunks(path, chunksize):
+        aggregates.update(chunk)
+    return aggregates
+
+
+if __name__ == "__main__":
+    # Uso: python -m sneakers.streaming [arquivo.csv] [linhas_por_bloco]
+    csv = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNKSIZE
+    result = stream_aggregates(csv, size)
+    print(f"Linhas: {result.n_rows}")
+    print(f"Tênis mais vendido: {result.best_seller}")
+    print(f"Vendas acima do varejo: {result.above_retail_rate:.2%}")
+    print("Participação por marca:")
+    print(result.brand_share.to_string())
+    for column in SUMMARY_COLUMNS:
+        stats = result.column_stats(column)
+        print(f"{column}: média {stats['mean']:.2f}, mediana {stats['median']:.2f}, moda {stats['mode']:.2f}")
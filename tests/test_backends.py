@@ -0,0 +1,70 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sneakers import backends, cube
+from sneakers.params import GROUP_LEVELS
+
+
+def test_missing_duckdb_is_a_clear_error(monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None if name == "duckdb" else find_spec(name))
+    with pytest.raises(ImportError, match="pip install duckdb"):
+        backends.open_backend("vendas.csv", "duckdb")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="desconhecido"):
+        backends.open_backend("vendas.csv", "sqlite")
+
+
+@pytest.fixture(scope="module")
+def both_backends(tmp_path_factory):
+    pytest.importorskip("duckdb")
+    from benchmarks.synthetic import make_raw_sales
+
+    path = str(tmp_path_factory.mktemp("dados") / "vendas.csv")
+    make_raw_sales(3_000).to_csv(path, index=False)
+    return backends.open_backend(path, "pandas"), backends.open_backend(path, "duckdb")
+
+
+def sorted_cells(cells, levels):
+    # As categorias de cada backend podem vir em outra ordem: compara como texto
+    labels = {level: str for level in levels if isinstance(cells[level].dtype, pd.CategoricalDtype)}
+    return cells.astype(labels).sort_values(levels, ignore_index=True)
+
+
+def test_duckdb_matches_pandas_summaries(both_backends):
+    pandas_backend, duckdb_backend = both_backends
+    assert duckdb_backend.n_rows() == pandas_backend.n_rows()
+    assert duckdb_backend.best_seller() == pandas_backend.best_seller()
+    expected = pandas_backend.column_summaries()
+    for column, summary in duckdb_backend.column_summaries().items():
+        assert summary.mean == pytest.approx(expected[column].mean)
+        assert summary.mode == pytest.approx(expected[column].mode)
+        assert summary.quantiles == pytest.approx(expected[column].quantiles)
+    pd.testing.assert_frame_equal(duckdb_backend.correlation(), pandas_backend.correlation())
+
+
+def test_duckdb_matches_pandas_groups_and_cube(both_backends):
+    pandas_backend, duckdb_backend = both_backends
+    counts = duckdb_backend.group_counts()
+    assert counts["count"].dtype == counts["above"].dtype == np.int64
+    pd.testing.assert_frame_equal(sorted_cells(counts, GROUP_LEVELS),
+                                  sorted_cells(pandas_backend.group_counts(), GROUP_LEVELS))
+    pd.testing.assert_frame_equal(sorted_cells(duckdb_backend.cube(), cube.CUBE_LEVELS),
+                                  sorted_cells(pandas_backend.cube(), cube.CUBE_LEVELS), check_exact=False)
+
+
+@pytest.mark.parametrize("brand", [None, "Yeezy"])
+def test_duckdb_matches_pandas_chart_data(both_backends, brand):
+    pandas_backend, duckdb_backend = both_backends
+    pd.testing.assert_frame_equal(duckdb_backend.chart_data("sale_price_hist", 200, brand),
+                                  pandas_backend.chart_data("sale_price_hist", 200, brand), check_dtype=False)
+    got = duckdb_backend.chart_data("price_days", 200, brand)
+    expected = pandas_backend.chart_data("price_days", 200, brand)
+    for got_part, expected_part in zip(got["density"], expected["density"]):
+        np.testing.assert_allclose(got_part, expected_part)
+    pd.testing.assert_frame_equal(got["trend"], expected["trend"], check_dtype=False)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers.data import clean_data
+
+
+def test_blank_and_malformed_dates_do_not_stop_cleaning():
+    raw = make_raw_sales(100)
+    raw.loc[3, "Order Date"] = np.nan
+    raw.loc[4, "Order Date"] = "13/45/19"
+    raw.loc[5, "Release Date"] = np.nan
+
+    df = clean_data(raw)
+    assert df.attrs["invalid_dates"] == {"Order Date": 2, "Release Date": 1}
+    assert len(df) == 98 and 3 not in df.index and 4 not in df.index
+    assert np.isnan(df.loc[5, "Days to Sell"])
+    assert df["Days to Sell"].notna().sum() == 97
+    assert df["Month"].dtype == np.int16
+
+
+def test_blank_delta_row_keeps_streaming(tmp_path):
+    from sneakers.streaming import stream_aggregates
+
+    raw = make_raw_sales(500)
+    raw.loc[10, "Release Date"] = np.nan
+    raw.loc[20, "Order Date"] = np.nan
+    path = tmp_path / "vendas.csv"
+    raw.to_csv(path, index=False)
+    assert stream_aggregates(str(path), chunksize=100).n_rows == 499
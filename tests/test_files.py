@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from sneakers import files
+from sneakers.files import atomic_write
+
+
+def write_text(text):
+    def write(path):
+        with open(path, "w") as f:
+            f.write(text)
+    return write
+
+
+def test_replaces_the_file_and_leaves_no_temporary(tmp_path):
+    path = tmp_path / "manifest.json"
+    assert atomic_write(str(path), write_text("novo"))
+    assert path.read_text() == "novo"
+    assert os.listdir(tmp_path) == ["manifest.json"]
+    # Mesma permissão de um open() comum, não a 0600 do mkstemp
+    assert path.stat().st_mode & 0o777 == 0o666 & ~files._UMASK
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("antigo")
+
+    def failing(tmp):
+        write_text("pela metade")(tmp)
+        raise OSError("disco cheio")
+
+    with pytest.raises(OSError):
+        atomic_write(str(path), failing)
+    assert not atomic_write(str(path), failing, required=False)
+    assert path.read_text() == "antigo"
+    assert os.listdir(tmp_path) == ["manifest.json"]
+
+
+def test_concurrent_writers_never_publish_a_partial_file(tmp_path):
+    import threading
+
+    path = str(tmp_path / "metrics.prom")
+    text = "x" * 100_000
+    errors, sizes = [], []
+
+    def writer():
+        try:
+            for _ in range(20):
+                atomic_write(path, write_text(text))
+                sizes.append(os.path.getsize(path))
+        except OSError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert set(sizes) == {len(text)}
+    assert os.listdir(tmp_path) == ["metrics.prom"]
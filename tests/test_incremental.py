@@ -0,0 +1,119 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers import incremental, loader
+from sneakers.data import clean_data
+
+
+@pytest.fixture
+def main_csv(tmp_path):
+    path = str(tmp_path / "vendas.csv")
+    make_raw_sales(2_000).to_csv(path, index=False)
+    return path
+
+
+def write_delta(path, rows, header=True, mode="w"):
+    with open(path, mode, newline="") as f:
+        f.write(rows.to_csv(index=False, header=header))
+
+
+def test_apply_delta_reads_only_new_complete_lines(main_csv):
+    delta = incremental.delta_path(main_csv)
+    rows = make_raw_sales(300, seed=1)
+    state = incremental.build_state(main_csv)
+    write_delta(delta, rows.iloc[:100])
+
+    assert incremental.apply_delta(state, delta) == 100
+    assert state.offsets[os.path.abspath(delta)] == os.path.getsize(delta)
+    assert incremental.apply_delta(state, delta) == 0
+
+    # Uma linha final sem "\n" (ainda sendo escrita) fica para a próxima chamada
+    text = rows.iloc[100:150].to_csv(index=False, header=False)
+    with open(delta, "a", newline="") as f:
+        f.write(text[:-10])
+    assert incremental.apply_delta(state, delta) == 49
+    with open(delta, "a", newline="") as f:
+        f.write(text[-10:])
+    assert incremental.apply_delta(state, delta) == 1
+    assert state.aggregates.n_rows == 2_150
+    assert state.offsets[os.path.abspath(delta)] == os.path.getsize(delta)
+
+
+def test_refresh_writes_state_only_when_it_changes(main_csv, monkeypatch):
+    delta = incremental.delta_path(main_csv)
+    write_delta(delta, make_raw_sales(100, seed=1))
+    incremental.refresh(main_csv, delta)
+
+    saves = []
+    monkeypatch.setattr(incremental, "_dump_state", lambda state, path: saves.append(path))
+    assert incremental.refresh(main_csv, delta).aggregates.n_rows == 2_100
+    assert saves == []
+
+    write_delta(delta, make_raw_sales(50, seed=2), header=False, mode="a")
+    incremental.refresh(main_csv, delta)
+    assert len(saves) == 1
+
+
+def test_refresh_keeps_state_when_it_cannot_be_saved(main_csv, monkeypatch):
+    def fail(state, path):
+        raise PermissionError(path)
+
+    delta = incremental.delta_path(main_csv)
+    write_delta(delta, make_raw_sales(100, seed=1))
+    monkeypatch.setattr(incremental, "_dump_state", fail)
+    assert incremental.refresh(main_csv, delta).aggregates.n_rows == 2_100
+    assert not os.path.exists(incremental.state_path(main_csv))
+
+
+def test_params_and_cube_include_delta_rows(main_csv):
+    rows = make_raw_sales(300, seed=1)
+    write_delta(incremental.delta_path(main_csv), rows)
+    both = clean_data(pd.concat([pd.read_csv(main_csv), rows], ignore_index=True))
+
+    loader.invalidate()
+    params = loader.load_params(path=main_csv)
+    cells = loader.load_cube(path=main_csv)
+    assert params.lookup()["count"] == len(both)
+    assert params.lookup()["above_rate"] == pytest.approx((both["Sale Price"] > both["Retail Price"]).mean())
+    brand = both["Brand"].iloc[0]
+    assert params.lookup(brand=brand)["count"] == (both["Brand"] == brand).sum()
+    assert cells["count"].sum() == len(both)
+    assert isinstance(cells["Brand"].dtype, pd.CategoricalDtype)
+
+    # Um novo acréscimo muda a chave e entra nos dois
+    write_delta(incremental.delta_path(main_csv), make_raw_sales(50, seed=2), header=False, mode="a")
+    assert loader.load_params(path=main_csv).lookup()["count"] == len(both) + 50
+    assert loader.load_cube(path=main_csv)["count"].sum() == len(both) + 50
+
+
+def test_sketches_include_delta_rows(main_csv):
+    rows = make_raw_sales(300, seed=1)
+    write_delta(incremental.delta_path(main_csv), rows)
+    both = clean_data(pd.concat([pd.read_csv(main_csv), rows], ignore_index=True))
+
+    loader.invalidate()
+    sketches = loader.load_sketches(0.01, path=main_csv)
+    assert sketches["Shoe Size"].n == both["Shoe Size"].notna().sum()
+    assert sketches["Days to Sell"].quantile(0.5) == pytest.approx(both["Days to Sell"].median(), rel=0.2)
+
+
+def test_chart_includes_delta_rows(main_csv):
+    rows = make_raw_sales(300, seed=1)
+    write_delta(incremental.delta_path(main_csv), rows)
+    both = clean_data(pd.concat([pd.read_csv(main_csv), rows], ignore_index=True))
+
+    loader.invalidate()
+    bars = loader.load_chart("sale_price_hist", path=main_csv).data[0]
+    assert sum(bars.y) == both["Sale Price"].notna().sum()
+
+    brand = both["Brand"].iloc[0]
+    bars = loader.load_chart("sale_price_hist", brand=brand, path=main_csv).data[0]
+    assert sum(bars.y) == (both["Brand"] == brand).sum()
+
+    # Um novo acréscimo muda a chave e entra no gráfico
+    write_delta(incremental.delta_path(main_csv), make_raw_sales(50, seed=2), header=False, mode="a")
+    bars = loader.load_chart("sale_price_hist", path=main_csv).data[0]
+    assert sum(bars.y) == both["Sale Price"].notna().sum() + 50
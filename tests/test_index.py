@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers.data import clean_data
+from sneakers.index import SalesIndex
+
+
+def test_rows_match_a_full_scan():
+    df = clean_data(make_raw_sales(3_000)).sort_values("Order Date", ignore_index=True)
+    index = SalesIndex(df)
+    brand, region = df["Brand"].iloc[0], df["Buyer Region"].iloc[0]
+    start, end = pd.Timestamp("2018-01-01"), pd.Timestamp("2018-12-31")
+
+    mask = (df["Brand"] == brand) & (df["Buyer Region"] == region)
+    mask &= (df["Order Date"] >= start) & (df["Order Date"] <= end)
+    assert np.array_equal(index.rows(start, end, brand=brand, region=region), np.flatnonzero(mask))
+    assert len(index.rows(brand="marca inexistente")) == 0
+
+
+def test_groups_are_compact():
+    df = clean_data(make_raw_sales(3_000)).sort_values("Order Date", ignore_index=True)
+    index = SalesIndex(df)
+    assert index.codes["Brand"].dtype == np.int8
+    assert index.order["Brand"].dtype == np.int32
+    brand = df["Brand"].iloc[-1]
+    code = index.lookup["Brand"][brand]
+    assert np.array_equal(index.group("Brand", code), np.flatnonzero(df["Brand"] == brand))
+
+    plain = SalesIndex(df.astype({"Brand": str}), levels=("Brand",))
+    assert np.array_equal(plain.select(brands=(brand,)).index, df[df["Brand"] == brand].index)
@@ -0,0 +1,26 @@
+from sneakers import instrument
+
+
+def test_fragment_rerun_is_recorded_on_its_own(monkeypatch):
+    monkeypatch.setattr(instrument, "debug_enabled", lambda: False)
+    finished = []
+    finish_run = instrument.finish_run
+    monkeypatch.setattr(instrument, "finish_run", lambda **kwargs: finished.append(finish_run(**kwargs)))
+
+    @instrument.fragment_run("analysis")
+    def secao():
+        with instrument.stage("simulation"):
+            pass
+        return instrument.current_run()
+
+    # Fragmento sozinho: abre e fecha a própria execução
+    run = secao()
+    assert run["page"] == "analysis:secao"
+    assert [stage["stage"] for stage in finished[0]["stages"]] == ["simulation"]
+    assert instrument.current_run() is None
+
+    # Dentro da execução da página: usa a execução dela
+    page = instrument.start_run("analysis")
+    assert secao() is page
+    assert len(finished) == 1
+    finish_run()
@@ -0,0 +1,17 @@
+import numpy as np
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers import parallel
+from sneakers.data import clean_data
+
+
+def test_null_keys_are_skipped(monkeypatch):
+    df = clean_data(make_raw_sales(3_000))
+    df.loc[5, "Shoe Size"] = np.nan
+    df.loc[7, "Buyer Region"] = np.nan
+
+    serial = parallel.group_stats(df, max_workers=1)
+    assert serial["count"].sum() == len(df) - 2
+
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_ROWS", 0)
+    assert parallel.group_stats(df, max_workers=2).equals(serial)
@@ -0,0 +1,26 @@
+from benchmarks.synthetic import make_raw_sales
+from sneakers.data import clean_data
+from sneakers.params import GROUP_LEVELS, ParamTable
+
+
+def scan(table, level, **filters):
+    # Mesma pergunta que ParamTable.values, respondida varrendo a tabela
+    mask = table[level].notna()
+    for name in GROUP_LEVELS:
+        if name != level:
+            value = filters.get(name)
+            mask &= table[name].isna() if value is None else table[name] == value
+    return table.loc[mask, level].tolist()
+
+
+def test_values_match_a_scan_of_the_table():
+    df = clean_data(make_raw_sales(2_000))
+    params = ParamTable(df)
+    brand = df["Brand"].iloc[0]
+    sneaker = df.loc[df["Brand"] == brand, "Sneaker Name"].iloc[0]
+
+    assert params.values("Brand") == scan(params.table, "Brand")
+    assert params.values("Sneaker Name", Brand=brand) == scan(params.table, "Sneaker Name", Brand=brand)
+    filters = {"Brand": brand, "Sneaker Name": sneaker}
+    assert params.values("Buyer Region", **filters) == scan(params.table, "Buyer Region", **filters)
+    assert params.values("Buyer Region", Brand="marca inexistente") == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from benchmarks.synthetic import make_raw_sales
+from sneakers import loader, partitions
+from sneakers.data import clean_data
+
+
+@pytest.fixture(scope="module")
+def sales():
+    return clean_data(make_raw_sales(5_000)).sort_values("Order Date", kind="stable", ignore_index=True)
+
+
+@pytest.fixture
+def by_brand(tmp_path, sales):
+    directory = str(tmp_path / "by_brand")
+    partitions.write_partitions(sales, directory, by="brand")
+    return directory
+
+
+def test_brand_query_reads_only_its_partitions(by_brand, sales):
+    df = partitions.read_partitions(by_brand, brands=("Off-White",))
+    assert df.attrs["partitions"] == (1, 2)
+    assert len(df) == (sales["Brand"] == "Off-White").sum()
+    assert df["Order Date"].is_monotonic_increasing
+
+
+def test_unsorted_parquet_partition_is_sorted_on_read(tmp_path, sales):
+    directory = tmp_path / "unsorted"
+    directory.mkdir()
+    shuffled = sales.sample(frac=1, random_state=0).reset_index(drop=True)
+    pq.write_table(pa.Table.from_pandas(shuffled, preserve_index=False), directory / "all.parquet")
+
+    df = partitions.read_partitions(str(directory), years=(2017, 2017), brands=(" Yeezy",))
+    expected = sales[(sales["Order Date"].dt.year == 2017) & (sales["Brand"] == " Yeezy")]
+    assert df["Order Date"].is_monotonic_increasing
+    assert len(df) == len(expected)
+    np.testing.assert_array_equal(np.sort(df["Sale Price"]), np.sort(expected["Sale Price"]))
+
+
+def test_brand_chart_goes_through_load_slice(by_brand, monkeypatch):
+    queries = []
+    read_partitions = partitions.read_partitions
+
+    def spy(directory, years=None, brands=None, max_workers=None):
+        df = read_partitions(directory, years=years, brands=brands, max_workers=max_workers)
+        queries.append((brands, df.attrs["partitions"]))
+        return df
+
+    monkeypatch.setattr(partitions, "read_partitions", spy)
+    loader.invalidate()
+    loader.load_chart("price_days", brand="Off-White", path=by_brand)
+    assert queries == [(("Off-White",), (1, 2))]
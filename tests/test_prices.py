@@ -0,0 +1,23 @@
+import numpy as np
+
+from sneakers.prices import parse_prices
+
+
+def test_malformed_prices_become_nan_and_are_counted():
+    values = ["$1,097", "$220", None, "n/a", "$1,097", "", "abc", "$15.50"]
+    parsed, invalid = parse_prices(values)
+    np.testing.assert_array_equal(parsed, [1097, 220, np.nan, np.nan, 1097, np.nan, np.nan, 15.5])
+    # Nulos não contam como malformados; cada ocorrência ruim conta
+    assert invalid == 3
+
+
+def test_repeated_malformed_value_counts_every_occurrence():
+    parsed, invalid = parse_prices(["x", "x", "$10", "x"], dtype=np.float32)
+    assert parsed.dtype == np.float32
+    assert invalid == 3
+
+
+def test_numeric_input_is_passed_through():
+    parsed, invalid = parse_prices(np.array([1.0, np.nan, 3.0]))
+    np.testing.assert_array_equal(parsed, [1.0, np.nan, 3.0])
+    assert invalid == 0
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from sneakers.sketch import DEFAULT_DELTA, QuantileSketch, merge_sketches, sketch_column, sketch_size
+
+QUERIES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def rank_error(sorted_values, value, q):
+    """Distância, em linhas, entre a posição de ``value`` e a posição exata do quantil ``q``."""
+    target = q * len(sorted_values)
+    lo = np.searchsorted(sorted_values, value, side="left")
+    hi = np.searchsorted(sorted_values, value, side="right")
+    return 0.0 if lo <= target <= hi else min(abs(lo - target), abs(hi - target))
+
+
+@pytest.mark.parametrize("eps", [0.05, 0.01])
+def test_rank_error_within_bound(eps):
+    rng = np.random.default_rng(0)
+    n = 300_000
+    for trial in range(5):
+        values = rng.lognormal(size=n)
+        sketch = sketch_column(values, eps, chunksize=70_000)
+        exact = np.sort(values)
+        assert sketch.rank_error <= eps * n
+        for q in QUERIES:
+            assert rank_error(exact, sketch.quantile(q), q) <= sketch.rank_error
+
+
+def test_failure_rate_below_delta():
+    # Muitos sketches pequenos: a fração de medianas fora de eps * n fica abaixo de delta
+    eps, n, trials = 0.05, 20_000, 300
+    failures = 0
+    for seed in range(trials):
+        values = np.random.default_rng(seed).standard_normal(n)
+        sketch = QuantileSketch(eps, seed=seed)
+        for chunk in np.array_split(values, 20):
+            sketch.update(chunk)
+        failures += rank_error(np.sort(values), sketch.quantile(0.5), 0.5) > eps * n
+    assert failures / trials <= DEFAULT_DELTA
+
+
+def test_compaction_variance_within_analysis():
+    # Os fatores usados por sketch_size: soma dos pesos² <= 12·n²/k² e topo <= 3n/k
+    values = np.random.default_rng(1).random(500_000)
+    parts = [QuantileSketch(0.02, seed=i).update(chunk) for i, chunk in enumerate(np.array_split(values, 7))]
+    sketch = merge_sketches(parts, 0.02)
+    assert sketch.n == len(values)
+    assert sketch.variance <= 12 * sketch.n ** 2 / sketch.k ** 2
+    assert 2 ** (len(sketch.levels) - 1) <= 3 * sketch.n / sketch.k
+
+
+def test_sketch_size_grows_with_confidence():
+    assert sketch_size(0.01, delta=0.001) > sketch_size(0.01, delta=0.01) > sketch_size(0.01, delta=0.1)
+    assert sketch_size(0.001) > sketch_size(0.01)
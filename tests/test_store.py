@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from sneakers.store import ResultStore
+
+
+def test_concurrent_cold_key_is_computed_once():
+    store = ResultStore(max_bytes=1_000)
+    calls = []
+    start = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"x" * 10
+
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(store.get("k", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    assert store.stats()["misses"] == 1 and store.stats()["hits"] == 7
+
+
+def test_failed_computation_is_retried():
+    store = ResultStore(max_bytes=1_000)
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("falhou")
+
+    errors = []
+    first = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, store.get, "k", failing)))
+    first.start()
+    started.wait()
+    # A segunda thread espera o cálculo em andamento; ele falha e ela calcula de novo
+    second_result = []
+    second = threading.Thread(target=lambda: second_result.append(store.get("k", lambda: b"ok")))
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join()
+    second.join()
+    assert len(errors) == 1
+    assert second_result == [b"ok"]
+    assert store.get("k", lambda: b"outro") == b"ok"
+
+
+def test_lru_eviction_and_byte_accounting():
+    store = ResultStore(max_bytes=100)
+    store.get("a", lambda: b"a" * 40)
+    store.get("b", lambda: b"b" * 40)
+    store.get("a", lambda: b"")  # "a" passa a ser o mais recente
+    store.get("c", lambda: b"c" * 40)
+
+    stats = store.stats()
+    assert stats["bytes"] == 80 and stats["entries"] == 2 and stats["evictions"] == 1
+    assert store.get("a", lambda: b"novo") == b"a" * 40
+    assert store.get("b", lambda: b"novo") == b"novo"  # "b" foi o descartado
+
+    store.clear()
+    assert store.stats()["bytes"] == 0 and store.stats()["entries"] == 0
+
+
+def test_oversized_value_is_returned_but_not_stored():
+    store = ResultStore(max_bytes=100)
+    store.get("small", lambda: b"s" * 40)
+    big = store.get("big", lambda: b"b" * 200)
+    assert big == b"b" * 200
+    stats = store.stats()
+    assert stats["bytes"] == 40 and stats["entries"] == 1 and stats["evictions"] == 0
+    assert store.get("big", lambda: b"recalculado") == b"recalculado"
+
+
+def test_discard_drops_matching_keys_and_their_bytes():
+    store = ResultStore(max_bytes=1_000)
+    store.get(("f", "a.csv", 1), lambda: b"x" * 40)
+    store.get(("f", "a.csv", 2), lambda: b"y" * 40)
+    store.get(("g", "b.csv", 1), lambda: b"z" * 40)
+
+    store.discard(lambda key: key[1] == "a.csv" and key[2] != 2)
+    stats = store.stats()
+    assert stats["bytes"] == 80 and stats["entries"] == 2
+    assert store.get(("f", "a.csv", 1), lambda: b"novo") == b"novo"
+    assert store.get(("f", "a.csv", 2), lambda: b"novo") == b"y" * 40
+
+
+def test_new_file_version_drops_old_store_entries(tmp_path):
+    from benchmarks.synthetic import make_raw_sales
+    from sneakers import loader
+    from sneakers.store import STORE
+
+    path = str(tmp_path / "vendas.csv")
+    make_raw_sales(500).to_csv(path, index=False)
+    loader.invalidate()
+    old = loader._signature(path)
+    loader.load_index(path=path)
+    assert STORE.stats()["entries"] > 0
+
+    make_raw_sales(600, seed=1).to_csv(path, index=False)
+    new = loader._signature(path)
+    assert new != old
+    assert not [key for key in STORE._entries if tuple(key[1:4]) == old]